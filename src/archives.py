@@ -0,0 +1,120 @@
+"""Загрузка архивов документации с пропуском неизменённых.
+
+Манифест `downloads/manifest.json` хранит для каждого архива адрес,
+`ETag`, `Last-Modified`, размер и SHA-256. Если локальный файл
+совпадает с манифестом, архив запрашивается условно и при ответе 304
+не загружается.
+"""
+import hashlib
+import logging
+
+from requests import RequestException
+
+import constants as const
+import fetch
+import throttle
+import utils
+
+UNCHANGED = 'не изменён'
+DOWNLOADED = 'загружен'
+FAILED = 'ошибка'
+
+
+def is_intact(path, entry):
+    """Проверяет, что локальный архив совпадает с записью манифеста.
+
+    Args:
+        path (Path): Путь к архиву.
+        entry (dict): Запись манифеста или None.
+
+    Returns:
+        bool: True, если размер и контрольная сумма совпадают.
+    """
+    return (
+        entry is not None
+        and path.exists()
+        and path.stat().st_size == entry['size']
+        and utils.file_sha256(path) == entry['sha256']
+    )
+
+
+def stream_to_file(response, path):
+    """Записывает тело ответа в файл по частям.
+
+    Args:
+        response (request.Response): Потоковый ответ сервера.
+        path (Path): Путь к файлу.
+
+    Raises:
+        RequestException: Соединение оборвалось во время чтения.
+        OSError: Ошибка записи файла.
+
+    Returns:
+        tuple(int, str): Размер и SHA-256 записанного тела.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'wb') as f:
+        for chunk in response.iter_content(const.DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def download_archive(session, url, downloads_dir, entry=None):
+    """Загружает архив, если он изменился с прошлой загрузки.
+
+    Архив читается потоком в обход HTTP-кеша во временный файл,
+    который заменяет прежний только после полной загрузки.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес архива.
+        downloads_dir (Path): Директория загрузок.
+        entry (dict): Запись манифеста о прошлой загрузке.
+
+    Returns:
+        tuple(str, dict): Итог загрузки и новая запись манифеста.
+    """
+    path = downloads_dir / url.split('/')[-1]
+    headers = {}
+    if is_intact(path, entry):
+        headers = fetch.conditional_headers(entry)
+    try:
+        response = throttle.send(
+            session, url,
+            get=lambda url: fetch.send_uncached(
+                session, url, headers=headers, stream=True
+            )
+        )
+    except RequestException:
+        logging.exception(
+            f'Возникла ошибка при загрузке архива {url}', stack_info=True
+        )
+        return FAILED, entry
+    with response:
+        if response.status_code == 304:
+            return UNCHANGED, entry
+        if response.status_code != 200:
+            logging.error(
+                f'Сервер ответил {response.status_code} на {url}'
+            )
+            return FAILED, entry
+        tmp_path = path.with_name(path.name + '.part')
+        try:
+            size, sha256 = stream_to_file(response, tmp_path)
+            tmp_path.replace(path)
+        except (RequestException, OSError):
+            logging.exception(
+                f'Возникла ошибка при загрузке архива {url}', stack_info=True
+            )
+            tmp_path.unlink(missing_ok=True)
+            return FAILED, entry
+    return DOWNLOADED, {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'size': size,
+        'sha256': sha256,
+    }
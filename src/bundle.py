@@ -0,0 +1,227 @@
+"""Переносимые архивы кешей: экспорт и импорт.
+
+Архив — tar.gz с файлом `manifest.json` и снимками баз SQLite:
+HTTP-кеша requests-cache и кешей разобранных результатов.
+"""
+import datetime as dt
+import io
+import json
+import logging
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+import constants as const
+import utils
+from exceptions import BundleException
+
+MANIFEST = 'manifest.json'
+
+
+def cache_db_path(session):
+    """Путь к базе SQLite HTTP-кеша сессии.
+
+    Args:
+        session (request.Session): Объект сессии.
+
+    Returns:
+        Path: Путь к базе.
+        None: Кеш сессии хранится не в SQLite.
+    """
+    cache = getattr(session, 'cache', None)
+    db_path = getattr(cache, 'db_path', None) or getattr(
+        getattr(cache, 'responses', None), 'db_path', None
+    )
+    if db_path is None or str(db_path) == ':memory:':
+        return None
+    return Path(db_path)
+
+
+def bundle_databases(session, base_dir):
+    """Базы, которые попадают в архив.
+
+    Args:
+        session (request.Session): Объект сессии.
+        base_dir (Path): Директория с кешами разобранных результатов.
+
+    Returns:
+        dict: {имя в архиве: путь к базе}.
+    """
+    databases = {
+        name: base_dir / name for name in const.BUNDLE_DATABASES
+    }
+    http_cache = cache_db_path(session)
+    if http_cache is None:
+        logging.warning('HTTP-кеш хранится не в SQLite и не будет перенесён')
+    else:
+        databases[const.HTTP_CACHE_NAME] = http_cache
+    return databases
+
+
+def snapshot(db_path, target):
+    """Делает согласованную копию базы SQLite, даже если она открыта.
+
+    Args:
+        db_path (Path): Исходная база.
+        target (Path): Файл копии.
+    """
+    with closing(sqlite3.connect(db_path)) as source, \
+            closing(sqlite3.connect(target)) as copy:
+        source.backup(copy)
+
+
+def export_bundle(databases, bundle_path):
+    """Упаковывает базы в сжатый архив с манифестом.
+
+    Args:
+        databases (dict): {имя в архиве: путь к базе}.
+        bundle_path (Path): Путь к архиву.
+
+    Returns:
+        dict: Манифест архива.
+    """
+    manifest = {
+        'format': const.BUNDLE_FORMAT,
+        'version': const.BUNDLE_VERSION,
+        'created': dt.datetime.now().isoformat(timespec='seconds'),
+        'files': {},
+    }
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            tarfile.open(bundle_path, 'w:gz') as tar:
+        for name, db_path in databases.items():
+            if not db_path.exists():
+                continue
+            copy_path = Path(tmp_dir) / name
+            snapshot(db_path, copy_path)
+            manifest['files'][name] = {
+                'size': copy_path.stat().st_size,
+                'sha256': utils.file_sha256(copy_path),
+            }
+            tar.add(copy_path, arcname=name)
+        data = json.dumps(manifest, indent=2).encode('utf-8')
+        info = tarfile.TarInfo(MANIFEST)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    logging.info(
+        f'Кеши {sorted(manifest["files"])} упакованы в архив: {bundle_path}'
+    )
+    return manifest
+
+
+def read_manifest(tar):
+    """Читает и проверяет манифест архива.
+
+    Args:
+        tar (tarfile.TarFile): Открытый архив.
+
+    Raises:
+        BundleException: Нет манифеста, чужой формат или версия.
+
+    Returns:
+        dict: Манифест архива.
+    """
+    try:
+        manifest = json.load(tar.extractfile(MANIFEST))
+    except KeyError:
+        raise BundleException('В архиве нет манифеста')
+    if manifest.get('format') != const.BUNDLE_FORMAT:
+        raise BundleException('Архив создан не этим парсером')
+    if manifest.get('version') != const.BUNDLE_VERSION:
+        raise BundleException(
+            f'Неподдерживаемая версия архива {manifest.get("version")}, '
+            f'ожидается {const.BUNDLE_VERSION}'
+        )
+    return manifest
+
+
+def merge_database(source, target):
+    """Переносит строки всех таблиц базы в другую базу.
+
+    Недостающие таблицы создаются, совпадающие ключи заменяются.
+
+    Args:
+        source (Path): База из архива.
+        target (Path): Рабочая база.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with closing(sqlite3.connect(target)) as conn, conn:
+        conn.execute('ATTACH DATABASE ? AS bundle', (str(source),))
+        tables = conn.execute(
+            "SELECT name, sql FROM bundle.sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        existing = {
+            name for name, in conn.execute(
+                "SELECT name FROM main.sqlite_master WHERE type = 'table'"
+            )
+        }
+        for name, sql in tables:
+            if name not in existing:
+                conn.execute(sql)
+            conn.execute(
+                f'INSERT OR REPLACE INTO main."{name}" '
+                f'SELECT * FROM bundle."{name}"'
+            )
+
+
+def import_bundle(databases, bundle_path):
+    """Распаковывает архив и объединяет его базы с рабочими.
+
+    Args:
+        databases (dict): {имя в архиве: путь к рабочей базе}.
+        bundle_path (Path): Путь к архиву.
+
+    Raises:
+        BundleException: Архив не найден, не читается, повреждён
+            или не прошёл проверку манифеста и контрольных сумм.
+
+    Returns:
+        list[str]: Имена импортированных баз.
+    """
+    try:
+        imported = unpack_databases(databases, bundle_path)
+    except (
+        OSError, tarfile.TarError, ValueError, KeyError,
+        sqlite3.DatabaseError
+    ) as error:
+        raise BundleException(
+            f'Не удалось прочитать архив {bundle_path}: {error}'
+        ) from error
+    logging.info(f'Из архива {bundle_path} импортированы кеши {imported}')
+    return imported
+
+
+def unpack_databases(databases, bundle_path):
+    """Проверяет базы из архива и объединяет их с рабочими.
+
+    Args:
+        databases (dict): {имя в архиве: путь к рабочей базе}.
+        bundle_path (Path): Путь к архиву.
+
+    Raises:
+        BundleException: Чужой манифест или неверная контрольная сумма.
+
+    Returns:
+        list[str]: Имена импортированных баз.
+    """
+    imported = []
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            tarfile.open(bundle_path, 'r:gz') as tar:
+        manifest = read_manifest(tar)
+        for name, meta in manifest['files'].items():
+            if name not in databases:
+                logging.warning(f'База {name} из архива пропущена')
+                continue
+            copy_path = Path(tmp_dir) / Path(name).name
+            with open(copy_path, 'wb') as f:
+                shutil.copyfileobj(tar.extractfile(name), f)
+            if utils.file_sha256(copy_path) != meta['sha256']:
+                raise BundleException(f'Повреждена база {name} в архиве')
+            merge_database(copy_path, databases[name])
+            imported.append(name)
+    return imported
@@ -0,0 +1,74 @@
+"""Запись ответов сервера в кассету для воспроизведения в нагрузочных тестах.
+
+Кассета — файл JSONL: по одной строке на ответ с методом, адресом,
+кодом, заголовками и телом в base64. Ответы перенаправлений
+записываются вместе с `Location`, чтобы при воспроизведении
+перенаправление выполнялось так же, как при записи.
+"""
+import base64
+import json
+import logging
+import threading
+
+import fetch
+
+RECORDED_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Retry-After',
+    'Location',
+)
+
+
+def record(session, cassette_path):
+    """Подключает к сессии запись всех ответов в кассету.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cassette_path (Path): Файл кассеты, дописывается.
+    """
+    cassette_path.parent.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+
+    def hook(response, *args, **kwargs):
+        interaction = {
+            'method': response.request.method,
+            'url': fetch.normalize_url(response.url),
+            'status': response.status_code,
+            'headers': {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS if name in response.headers
+            },
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        line = json.dumps(interaction, ensure_ascii=False)
+        with lock, open(cassette_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        return response
+
+    session.hooks['response'].append(hook)
+    logging.info(f'Ответы сервера записываются в кассету: {cassette_path}')
+
+
+def load(cassette_path):
+    """Читает кассету.
+
+    Для запроса, записанного несколько раз, берётся последний ответ.
+    В кассетах без метода все ответы считаются ответами на GET.
+
+    Args:
+        cassette_path (Path): Файл кассеты.
+
+    Returns:
+        dict: {(метод, нормализованный адрес): (код, заголовки, тело)}.
+    """
+    interactions = {}
+    with open(cassette_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            interactions[item.get('method', 'GET'), item['url']] = (
+                item['status'],
+                item['headers'],
+                base64.b64decode(item['body']),
+            )
+    return interactions
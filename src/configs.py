@@ -2,11 +2,58 @@
 """
 import argparse
 import logging
+import re
 from logging.handlers import RotatingFileHandler as RFHandler
+from pathlib import Path
 
 import constants as const
 
 
+def shard_type(value):
+    """Разбирает значение аргумента `--shard` вида `i/N`.
+
+    Args:
+        value (str): Значение из командной строки.
+
+    Raises:
+        argparse.ArgumentTypeError: Некорректный формат или номер шарда.
+
+    Returns:
+        tuple(int, int): Номер шарда (начиная с 1), количество шардов.
+    """
+    match = re.fullmatch(r'(?P<shard>\d+)/(?P<shards>\d+)', value)
+    if match is None:
+        raise argparse.ArgumentTypeError(
+            f'Ожидается значение вида i/N, получено {value}'
+        )
+    shard, shards = int(match['shard']), int(match['shards'])
+    if not 1 <= shard <= shards:
+        raise argparse.ArgumentTypeError(
+            f'Номер шарда должен быть от 1 до {shards}'
+        )
+    return shard, shards
+
+
+def filter_type(value):
+    """Разбирает значение аргумента `--where` вида `поле=значение`.
+
+    Args:
+        value (str): Значение из командной строки.
+
+    Raises:
+        argparse.ArgumentTypeError: Нет знака `=` или имени поля.
+
+    Returns:
+        tuple(str, str): Поле шапки PEP`а и его значение.
+    """
+    name, sep, field_value = value.partition('=')
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(
+            f'Ожидается значение вида поле=значение, получено {value}'
+        )
+    return name.strip(), field_value.strip()
+
+
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
@@ -23,13 +70,155 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=('pretty', 'file'),
+        choices=('pretty', 'file', 'parquet', 'arrow'),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        help='Постраничный вывод таблицы `pretty` в терминал'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=const.WORKERS,
+        help=(
+            'Начальное количество одновременных загрузок с одного хоста '
+            '(дальше лимит подстраивается под ответы сервера)'
+        )
+    )
+    parser.add_argument(
+        '--formats',
+        nargs='+',
+        choices=const.ARCHIVE_FORMATS,
+        default=const.DOWNLOAD_FORMATS,
+        help='Форматы архивов документации для режима `download`'
+    )
+    parser.add_argument(
+        '--shard',
+        type=shard_type,
+        metavar='i/N',
+        help='Обработать только шард i из N индекса PEP'
+    )
+    parser.add_argument(
+        '--shard-dir',
+        type=Path,
+        help='Директория для файлов шардов'
+    )
+    parser.add_argument(
+        '-t',
+        '--target',
+        choices=const.TARGET_MODES,
+        help=(
+            'Режим, прогоны которого показывает `history` и сравнивает '
+            f'`diff` ({", ".join(const.HISTORY_TARGETS)}), а страницы '
+            'загружает `cache-prefetch`'
+        )
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        nargs=2,
+        metavar=('OLD', 'NEW'),
+        help='Номера сравниваемых прогонов из истории'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=const.WATCH_INTERVAL,
+        help='Интервал опроса в режиме `watch`, секунд'
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=0,
+        help='Количество опросов в режиме `watch`, 0 — без ограничения'
+    )
+    parser.add_argument(
+        '--events-file',
+        type=Path,
+        help='Файл JSONL для событий режима `watch` вместо stdout'
+    )
+    parser.add_argument(
+        '--bundle',
+        type=Path,
+        help='Архив кешей для `cache-export` и `cache-import`'
+    )
+    parser.add_argument(
+        '--record',
+        type=Path,
+        metavar='CASSETTE',
+        help='Записать ответы сервера в кассету для `loadtest.py`'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продолжить прерванный прогон `pep` или `whats-new` по журналу'
+    )
+    parser.add_argument(
+        '--progress',
+        choices=const.PROGRESS_SINKS,
+        default='auto',
+        help=(
+            'Приёмник событий прогресса: полоса в терминале, лог или '
+            'файл JSONL (по умолчанию полоса, если вывод в терминал)'
+        )
+    )
+    parser.add_argument(
+        '--progress-file',
+        default=const.PROGRESS_FILE,
+        help='Файл событий прогресса для `--progress jsonl`'
+    )
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Вывести пик памяти и основные места выделения по стадиям'
+    )
+    parser.add_argument(
+        '--ttl',
+        type=float,
+        default=const.LINK_CHECK_TTL,
+        help='Срок годности результатов `link-check`, секунд'
+    )
+    parser.add_argument(
+        '--where',
+        type=filter_type,
+        action='append',
+        default=[],
+        metavar='FIELD=VALUE',
+        help='Фильтр режима `pep-query` по полю шапки PEP`а'
+    )
+    parser.add_argument(
+        '--group-by',
+        metavar='FIELD',
+        help='Посчитать PEP`ы в режиме `pep-query` по значениям поля'
+    )
 
     return parser
 
 
+def check_target(parser, args):
+    """Проверяет, что режим из `-t` подходит выбранному режиму.
+
+    В историю сохраняются не все режимы, поэтому `history` и `diff`
+    принимают только `const.HISTORY_TARGETS`.
+
+    Args:
+        parser (ArgumentParser): Парсер аргументов.
+        args (Namespace): Разобранные аргументы.
+    """
+    if (
+        args.mode in ('history', 'diff')
+        and args.target is not None
+        and args.target not in const.HISTORY_TARGETS
+    ):
+        parser.error(
+            f'аргумент -t/--target: режим {args.mode} принимает только '
+            f'{", ".join(const.HISTORY_TARGETS)}'
+        )
+
+
 def configure_logging():
     log_dir = const.BASE_DIR / 'logs'
     log_dir.mkdir(exist_ok=True)
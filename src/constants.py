@@ -2,6 +2,8 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).parent
 
+DEFAULT_ENCODING = 'utf-8'
+
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
@@ -12,6 +14,30 @@ MAIN_DOC_URL = 'https://docs.python.org/3/'
 
 PEP_DOC_URL = 'https://peps.python.org/'
 
+SPHINX_HOSTS = ('docs.python.org', 'peps.python.org')
+
+WORKERS = 8
+
+HOST_CONCURRENCY = 4
+
+MAX_HOST_CONCURRENCY = 32
+
+PARALLEL_HOSTS = 16
+
+LATENCY_THRESHOLD = 2.0
+
+DECREASE_FACTOR = 0.5
+
+MAX_RETRIES = 3
+
+RETRY_BACKOFF = 1.0
+
+MAX_RETRY_AFTER = 60.0
+
+PARTIAL_HEADER = 'X-Parser-Partial'
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
 EXPECTED_STATUS = {
     'A': ['Active', 'Accepted'],
     'D': ['Deferred'],
@@ -22,3 +48,79 @@ EXPECTED_STATUS = {
     'W': ['Withdrawn'],
     '': ['Draft', 'Active'],
 }
+
+HISTORY_DB = 'history.sqlite3'
+
+HISTORY_MODES = {
+    'whats-new': 'whats-new',
+    'latest-versions': 'latest-versions',
+    'pep': 'pep',
+    'merge': 'pep',
+}
+
+HISTORY_TARGETS = tuple(dict.fromkeys(HISTORY_MODES.values()))
+
+WATCH_STATE = 'watch_state.json'
+
+WATCH_INTERVAL = 300
+
+BUNDLE_FORMAT = 'python-docs-parser-cache'
+
+BUNDLE_VERSION = 1
+
+BUNDLE_NAME = 'cache_bundle.tar.gz'
+
+HTTP_CACHE_NAME = 'http_cache.sqlite'
+
+PEP_DB = 'pep.sqlite3'
+
+LINK_CHECK_DB = 'link_check.sqlite3'
+
+BUNDLE_DATABASES = (PEP_DB, LINK_CHECK_DB)
+
+TARGET_MODES = ('whats-new', 'latest-versions', 'pep', 'download')
+
+LOADTEST_MODES = (
+    'whats-new', 'latest-versions', 'pep', 'download', 'version-matrix',
+    'link-check', 'cache-prefetch'
+)
+
+TABLE_SAMPLE_SIZE = 200
+
+TABLE_MAX_COLUMN_WIDTH = 120
+
+ARCHIVE_FORMATS = ('pdf-a4', 'pdf-letter', 'html', 'text', 'epub')
+
+DOWNLOAD_FORMATS = ('pdf-a4',)
+
+DOWNLOAD_MANIFEST = 'manifest.json'
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+PEP_LIST_FIELDS = (
+    'Author', 'Requires', 'Replaces', 'Superseded-By', 'Python-Version',
+)
+
+MEMORY_TOP_SITES = 5
+
+COLUMNAR_BATCH_SIZE = 10_000
+
+LINK_CHECK_TTL = 24 * 60 * 60
+
+LINK_CHECK_FAILURE_TTL = 10 * 60
+
+LINK_CHECK_TIMEOUT = 10.0
+
+JOURNAL_DIR = 'journal'
+
+JOURNAL_BATCH_SIZE = 50
+
+PROGRESS_SINKS = ('auto', 'bar', 'log', 'jsonl', 'none')
+
+PROGRESS_FILE = 'progress.jsonl'
+
+PROGRESS_INTERVAL = 1.0
+
+PROGRESS_BAR_INTERVAL = 0.1
+
+PROGRESS_BAR_WIDTH = 30
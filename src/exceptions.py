@@ -8,3 +8,34 @@ class TableException(Exception):
     """Вызывается при несоответствии таблицы на странице ожиданиям.
     """
     pass
+
+
+class ShardException(Exception):
+    """Вызывается при неполном или несогласованном наборе шардов.
+    """
+    pass
+
+
+class HistoryException(Exception):
+    """Вызывается, когда в истории нет запрошенных прогонов.
+    """
+    pass
+
+
+class BundleException(Exception):
+    """Вызывается при некорректном архиве кешей.
+    """
+    pass
+
+
+class PepDatabaseException(Exception):
+    """Вызывается, когда база метаданных PEP`ов ещё не заполнена.
+    """
+    pass
+
+
+class JournalException(Exception):
+    """Вызывается, когда журнал прерванного прогона перезаписывается
+    без `--resume`.
+    """
+    pass
@@ -0,0 +1,362 @@
+"""Слой загрузки страниц: нормализация адресов и объединение запросов.
+"""
+import collections
+import inspect
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import constants as const
+import throttle
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+STATS = collections.Counter()
+
+_inflight = {}
+_lock = threading.Lock()
+
+
+def normalize_url(url):
+    """Приводит разные написания одного адреса к единому виду.
+
+    Для всех адресов отбрасывается фрагмент, схема и хост приводятся
+    к нижнему регистру, убирается порт по умолчанию. Для сайтов
+    документации из `const.SPHINX_HOSTS` дополнительно схлопываются
+    повторные `/`, `index.html` заменяется на `/`, а путь без
+    расширения дополняется `/`. На других сайтах путь не меняется:
+    повторные `/` там могут быть значимы.
+
+    Args:
+        url (str): Адрес web-страницы.
+
+    Returns:
+        str: Нормализованный адрес.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{host}:{parts.port}'
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo += f':{parts.password}'
+        netloc = f'{userinfo}@{netloc}'
+
+    path = parts.path or '/'
+    if host in const.SPHINX_HOSTS:
+        path = re.sub(r'/{2,}', '/', path)
+        if path.endswith('/index.html'):
+            path = path[:-len('index.html')]
+        elif not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+            path += '/'
+    return urlunsplit((scheme, netloc, path, parts.query, ''))
+
+
+def get(session, url, allow_partial=False):
+    """Загружает страницу, объединяя одновременные запросы одного адреса.
+
+    Пока загрузка адреса выполняется, остальные потоки с тем же
+    (нормализованным) адресом ждут её результат, а не идут в сеть.
+    Сама загрузка идёт через адаптивный лимит хоста `throttle.send`.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        allow_partial (bool): Принять из кеша начало страницы,
+            сохранённое `save_to_cache` с пометкой о неполноте.
+
+    Raises:
+        RequestException: Ошибка загрузки, общая для всех ожидающих.
+
+    Returns:
+        response(request.Response): Ответ сервера.
+    """
+    normalized = normalize_url(url)
+    key = (id(session), normalized, allow_partial)
+    with _lock:
+        STATS['requests'] += 1
+        if normalized != url:
+            STATS['normalized'] += 1
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+        else:
+            STATS['coalesced'] += 1
+    if not leader:
+        return future.result()
+
+    try:
+        response = _load(session, normalized, allow_partial)
+    except BaseException as error:
+        future.set_exception(error)
+        raise
+    else:
+        future.set_result(response)
+        with _lock:
+            STATS['fetched'] += 1
+            if getattr(response, 'from_cache', False):
+                STATS['from_cache'] += 1
+        return response
+    finally:
+        with _lock:
+            del _inflight[key]
+
+
+def _load(session, url, allow_partial):
+    """Загружает страницу; частичную запись кеша заменяет полной.
+    """
+    response = throttle.send(session, url)
+    if not allow_partial and response.headers.get(const.PARTIAL_HEADER):
+        response = throttle.send(
+            session, url, get=lambda url: send_uncached(session, url)
+        )
+        save_to_cache(session, response)
+    return response
+
+
+def send_uncached(session, url, headers=None, stream=False, method='GET',
+                  timeout=None):
+    """Выполняет запрос сессии в обход кеша.
+
+    В отличие от `CachedSession.cache_disabled()` не отключает кеш
+    для остальных потоков, работающих с той же сессией.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        headers (dict): Дополнительные заголовки запроса.
+        stream (bool): Не читать тело ответа сразу.
+        method (str): HTTP-метод.
+        timeout (float): Таймаут соединения и чтения, секунд.
+
+    Returns:
+        response(request.Response): Ответ сервера.
+    """
+    prepared = session.prepare_request(
+        requests.Request(method, url, headers=headers)
+    )
+    settings = session.merge_environment_settings(
+        prepared.url, {}, stream, None, None
+    )
+    return requests.Session.send(
+        session, prepared, timeout=timeout, **settings
+    )
+
+
+def conditional_headers(validators):
+    """Заголовки условного запроса по сохранённым валидаторам ответа.
+
+    Args:
+        validators (dict): Словарь с `etag` и `last_modified`.
+
+    Returns:
+        dict: Заголовки `If-None-Match` и `If-Modified-Since`.
+    """
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def mount_pool(session, size=const.MAX_HOST_CONCURRENCY):
+    """Расширяет пул соединений сессии до максимального лимита хоста.
+
+    По умолчанию urllib3 держит 10 соединений на хост; лишние
+    соединения при параллельной загрузке закрывались бы после
+    каждого ответа.
+
+    Args:
+        session (request.Session): Объект сессии.
+        size (int): Количество соединений на хост.
+    """
+    adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
+def is_cached(session, url):
+    """Проверяет, есть ли в кеше сессии ответ для адреса.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+
+    Returns:
+        bool: True, если ответ есть в кеше.
+    """
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        return False
+    if hasattr(cache, 'contains'):
+        return cache.contains(url=url)
+    return cache.has_url(url)
+
+
+def open_stream(session, url):
+    """Открывает ответ для потокового чтения в обход кеша.
+
+    Запрос проходит через адаптивный лимит хоста; время ответа
+    считается до получения заголовков.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+
+    Returns:
+        response(request.Response): Ответ с непрочитанным телом.
+    """
+    count('streamed')
+    return throttle.send(
+        session, url,
+        get=lambda url: send_uncached(session, url, stream=True)
+    )
+
+
+def save_to_cache(session, response, complete=True, body=None):
+    """Сохраняет ответ, полученный в обход кеша, в кеш сессии.
+
+    Если тело прочитано не полностью, запись помечается заголовком
+    `const.PARTIAL_HEADER`: такие записи годятся только для чтения
+    начала страницы, а `get` при обращении к ним загружает страницу
+    заново.
+
+    Args:
+        session (request.Session): Объект сессии.
+        response(request.Response): Ответ сервера.
+        complete (bool): Тело ответа прочитано полностью.
+        body (bytes): Прочитанное потоком тело ответа.
+    """
+    if body is not None:
+        response._content = body
+        response._content_consumed = True
+        count('streamed_bytes', len(body))
+        count('truncated', not complete)
+    cache = getattr(session, 'cache', None)
+    if cache is None or response.status_code != 200:
+        return
+    if complete:
+        response.headers.pop(const.PARTIAL_HEADER, None)
+    else:
+        response.headers[const.PARTIAL_HEADER] = '1'
+        response.headers.pop('Content-Length', None)
+    if 'key' in inspect.signature(cache.save_response).parameters:
+        # requests-cache 0.6: save_response(key, response).
+        cache.save_response(cache.create_key(response.request), response)
+    else:
+        cache.save_response(response)
+
+
+def count(name, value=1):
+    """Увеличивает счётчик статистики загрузок.
+
+    Args:
+        name (str): Имя счётчика.
+        value (int): Приращение.
+    """
+    with _lock:
+        STATS[name] += value
+
+
+def parallel_map(func, items, workers=const.WORKERS, url=None):
+    """Применяет функцию к элементам в пуле потоков.
+
+    С `url` элементы распределяются по хостам: у каждого хоста своя
+    очередь с пулом размером с максимальный лимит хоста, так что
+    одновременность запросов задаёт только адаптивный лимит
+    `throttle`, а ожидание лимита одного хоста не задерживает другие
+    хосты. `workers` в этом случае — начальный лимит хоста.
+
+    Если результаты перестали забирать (например, из-за исключения),
+    ещё не начатые задачи отменяются.
+
+    Args:
+        func (callable): Функция одного аргумента.
+        items (list): Элементы.
+        workers (int): Количество потоков; 1 — последовательно.
+        url (callable): Адрес, загружаемый для элемента.
+
+    Yields:
+        Результаты в порядке элементов.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    if url is not None:
+        yield from _host_map(func, list(items), workers, url)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _host_map(func, items, workers, url):
+    futures = [Future() for _ in items]
+    lanes = collections.defaultdict(list)
+    for index, item in enumerate(items):
+        limiter = throttle.limiter_for(url(item))
+        lanes[limiter].append(index)
+
+    def run(index):
+        if not futures[index].set_running_or_notify_cancel():
+            return
+        try:
+            futures[index].set_result(func(items[index]))
+        except BaseException as error:
+            futures[index].set_exception(error)
+
+    def run_lane(limiter, indexes):
+        limiter.start_at(workers)
+        size = min(limiter.maximum, len(indexes))
+        with ThreadPoolExecutor(max_workers=size) as lane:
+            lane.map(run, indexes)
+
+    with ThreadPoolExecutor(max_workers=const.PARALLEL_HOSTS) as executor:
+        for limiter, indexes in lanes.items():
+            executor.submit(run_lane, limiter, indexes)
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def log_stats():
+    """Записывает в лог счётчики запросов и дедупликации.
+    """
+    if not STATS['requests']:
+        return
+    logging.info(
+        f'Запросов страниц: {STATS["requests"]}, '
+        f'нормализовано адресов: {STATS["normalized"]}, '
+        f'объединено одновременных запросов: {STATS["coalesced"]}, '
+        f'выполнено загрузок: {STATS["fetched"]}, '
+        f'из них из кеша: {STATS["from_cache"]}'
+    )
+    if STATS['streamed']:
+        logging.info(
+            f'Потоковых загрузок начала страниц: {STATS["streamed"]}, '
+            f'прервано досрочно: {STATS["truncated"]}, '
+            f'прочитано байт: {STATS["streamed_bytes"]}'
+        )
+    for host, limit, _, throttled, retries in throttle.snapshot():
+        logging.info(
+            f'Хост {host}: лимит одновременных запросов {limit}, '
+            f'ответов 429/503: {throttled}, повторов: {retries}'
+        )
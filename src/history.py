@@ -0,0 +1,198 @@
+"""Локальное хранилище истории прогонов парсера.
+"""
+import datetime as dt
+import json
+import sqlite3
+from contextlib import closing
+
+import records
+from exceptions import HistoryException
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_mode_started_at ON runs (mode, started_at);
+CREATE TABLE IF NOT EXISTS rows (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, key)
+) WITHOUT ROWID;
+"""
+
+DIFF_QUERY = """
+SELECT 'added', new.key, NULL, new.data
+FROM rows AS new
+LEFT JOIN rows AS old ON old.run_id = :old AND old.key = new.key
+WHERE new.run_id = :new AND old.key IS NULL
+UNION ALL
+SELECT 'removed', old.key, old.data, NULL
+FROM rows AS old
+LEFT JOIN rows AS new ON new.run_id = :new AND new.key = old.key
+WHERE old.run_id = :old AND new.key IS NULL
+UNION ALL
+SELECT 'changed', new.key, old.data, new.data
+FROM rows AS new
+JOIN rows AS old ON old.run_id = :old AND old.key = new.key
+WHERE new.run_id = :new AND old.data != new.data
+"""
+
+CHANGE_NAMES = {
+    'added': 'Добавлено',
+    'removed': 'Удалено',
+    'changed': 'Изменено',
+}
+
+
+def connect(db_path):
+    """Открывает базу истории и создаёт схему при необходимости.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+
+    Returns:
+        sqlite3.Connection: Соединение с базой.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_run(db_path, mode, results):
+    """Сохраняет результаты прогона в историю.
+
+    Ключом строки служит её первый столбец.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        mode (str): Режим работы парсера.
+        results (list[tuple]): Результаты с заголовком в results[0].
+
+    Returns:
+        int: Номер сохранённого прогона.
+    """
+    header, *rows = results
+    started_at = dt.datetime.now().isoformat(timespec='microseconds')
+    with closing(connect(db_path)) as conn, conn:
+        cursor = conn.execute(
+            'INSERT INTO runs (mode, started_at, header) VALUES (?, ?, ?)',
+            (mode, started_at, json.dumps(header, ensure_ascii=False))
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT OR REPLACE INTO rows (run_id, key, data) VALUES (?, ?, ?)',
+            (
+                (run_id, str(row[0]), json.dumps(row, ensure_ascii=False))
+                for row in rows
+            )
+        )
+    return run_id
+
+
+def list_runs(db_path, mode):
+    """Возвращает прогоны режима от новых к старым.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        mode (str): Режим работы парсера.
+
+    Returns:
+        list[records.HistoryRun]: Номер прогона, время запуска,
+            количество строк.
+    """
+    with closing(connect(db_path)) as conn:
+        return [
+            records.HistoryRun(*row) for row in conn.execute(
+                'SELECT runs.id, runs.started_at, '
+                '(SELECT count(*) FROM rows WHERE rows.run_id = runs.id) '
+                'FROM runs WHERE mode = ? ORDER BY started_at DESC, id DESC',
+                (mode,)
+            )
+        ]
+
+
+def resolve_runs(conn, mode, runs=None):
+    """Определяет пару прогонов для сравнения.
+
+    Args:
+        conn (sqlite3.Connection): Соединение с базой.
+        mode (str): Режим работы парсера.
+        runs (tuple(int, int)): Номера прогонов. По умолчанию два
+            последних прогона режима.
+
+    Raises:
+        HistoryException: Прогоны не найдены или относятся к другому режиму.
+
+    Returns:
+        tuple(int, int): Номера старого и нового прогонов.
+    """
+    if runs is None:
+        found = conn.execute(
+            'SELECT id FROM runs WHERE mode = ? '
+            'ORDER BY started_at DESC, id DESC LIMIT 2',
+            (mode,)
+        ).fetchall()
+        if len(found) < 2:
+            raise HistoryException(
+                f'В истории меньше двух прогонов режима {mode}'
+            )
+        return found[1][0], found[0][0]
+
+    for run_id in runs:
+        found = conn.execute(
+            'SELECT mode FROM runs WHERE id = ?', (run_id,)
+        ).fetchone()
+        if found is None or found[0] != mode:
+            raise HistoryException(
+                f'Прогон {run_id} режима {mode} не найден в истории'
+            )
+    return tuple(runs)
+
+
+def diff_runs(db_path, mode, runs=None):
+    """Сравнивает строки двух прогонов режима.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        mode (str): Режим работы парсера.
+        runs (tuple(int, int)): Номера прогонов. По умолчанию два
+            последних прогона режима.
+
+    Returns:
+        results (list[tuple]): Добавленные, удалённые и изменённые строки.
+    """
+    with closing(connect(db_path)) as conn:
+        old, new = resolve_runs(conn, mode, runs)
+        changes = conn.execute(
+            DIFF_QUERY, {'old': old, 'new': new}
+        ).fetchall()
+
+    results = [records.Change.HEADER]
+    for change, key, old_data, new_data in changes:
+        results.append(records.Change(
+            CHANGE_NAMES[change],
+            key,
+            format_row(old_data),
+            format_row(new_data),
+        ))
+    return results
+
+
+def format_row(data):
+    """Превращает сохранённую строку в текст без ключевого столбца.
+
+    Args:
+        data (str): Строка в формате JSON или None.
+
+    Returns:
+        str: Значения столбцов через ` | `.
+    """
+    if data is None:
+        return ''
+    return ' | '.join(str(value) for value in json.loads(data)[1:])
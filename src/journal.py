@@ -0,0 +1,144 @@
+"""Журнал обработанных страниц для продолжения прерванных прогонов.
+
+Журнал — файл JSONL, в который дописывается адрес каждой
+обработанной страницы и извлечённый из неё результат. Записи
+сбрасываются на диск пакетами по `const.JOURNAL_BATCH_SIZE`.
+С `--resume` страницы из журнала не загружаются повторно, а их
+результаты берутся из журнала. Журнал удаляется явно (`commit`),
+когда режим сохранил свои результаты.
+"""
+import json
+import logging
+import os
+
+import constants as const
+from exceptions import JournalException
+
+
+def load(path):
+    """Читает журнал, отбрасывая недописанную последнюю запись.
+
+    Args:
+        path (Path): Путь к журналу.
+
+    Returns:
+        dict: {адрес: результат}.
+    """
+    if not path.exists():
+        return {}
+    with open(path, 'r+b') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+    done = {}
+    for line in data[:complete].splitlines():
+        entry = json.loads(line)
+        done[entry['url']] = entry['result']
+    return done
+
+
+class Journal:
+    """Журнал прогона режима.
+
+    Используется как контекстный менеджер: при выходе буфер
+    сбрасывается на диск. Журнал остаётся, пока режим не вызовет
+    `commit` после сохранения результатов.
+
+    Raises:
+        JournalException: Журнал прерванного прогона уже есть,
+            а `resume` не задан.
+    """
+
+    def __init__(self, path, resume=False,
+                 batch_size=const.JOURNAL_BATCH_SIZE):
+        if not resume and path.exists():
+            raise JournalException(
+                f'Есть журнал прерванного прогона {path}: продолжите его '
+                'с `--resume` или удалите файл'
+            )
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.done = load(path) if resume else {}
+        if self.done:
+            logging.info(
+                f'Из журнала {path} восстановлено страниц: {len(self.done)}'
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        self.file.close()
+        if exc_type is not None:
+            logging.warning(
+                f'Прогон прерван, продолжить можно с `--resume`: {self.path}'
+            )
+
+    def commit(self):
+        """Удаляет журнал: результаты прогона сохранены.
+        """
+        if not self.file.closed:
+            self.file.close()
+        self.path.unlink(missing_ok=True)
+
+    def record(self, url, result):
+        """Добавляет результат страницы в журнал.
+
+        Args:
+            url (str): Адрес страницы.
+            result: Результат страницы, сериализуемый в JSON.
+        """
+        self.buffer.append(
+            json.dumps({'url': url, 'result': result}, ensure_ascii=False)
+        )
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Сбрасывает накопленные записи на диск.
+        """
+        if not self.buffer:
+            return
+        self.file.write('\n'.join(self.buffer) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.buffer.clear()
+
+    def pending(self, urls):
+        """Адреса, которых ещё нет в журнале.
+
+        Args:
+            urls (list[str]): Адреса страниц.
+
+        Returns:
+            list[str]: Необработанные адреса.
+        """
+        return [url for url in urls if url not in self.done]
+
+    def replay(self, urls, fetched):
+        """Результаты страниц по порядку: из журнала или из загрузки.
+
+        Новые результаты записываются в журнал; страницы с ошибкой
+        загрузки (None) не записываются и будут обработаны заново.
+
+        Args:
+            urls (list[str]): Адреса всех страниц.
+            fetched (iterable): Результаты для `pending(urls)` по порядку.
+
+        Yields:
+            Результат каждой страницы из `urls`.
+        """
+        fetched = iter(fetched)
+        for url in urls:
+            if url in self.done:
+                yield self.done[url]
+                continue
+            result = next(fetched)
+            if result is not None:
+                self.record(url, result)
+            yield result
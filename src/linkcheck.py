@@ -0,0 +1,172 @@
+"""Проверка ссылок: HEAD с откатом на GET и кеш результатов с TTL.
+
+Запросы идут через адаптивный лимит хоста `throttle.send`, поэтому
+одновременные проверки ссылок на один сайт ограничиваются
+независимо от ссылок на другие сайты. Результаты сохраняются в базу
+SQLite и переиспользуются, пока не истечёт TTL. Временные сбои
+(ошибки соединения, 429 и 5xx) хранятся не дольше
+`const.LINK_CHECK_FAILURE_TTL`, чтобы ссылка не считалась
+неработающей до следующих суток из-за одного сбоя сети.
+"""
+import logging
+import sqlite3
+import time
+from contextlib import closing
+
+from requests import RequestException
+
+import constants as const
+import fetch
+import throttle
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    latency REAL NOT NULL,
+    error TEXT NOT NULL,
+    checked_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS links_checked_at ON links (checked_at);
+"""
+
+DEFINITIVE = 'status BETWEEN 1 AND 499 AND status != 429'
+
+
+def connect(db_path):
+    """Открывает базу результатов проверки и создаёт схему.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+
+    Returns:
+        sqlite3.Connection: Соединение с базой.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_fresh(db_path, ttl):
+    """Результаты проверок, выполненных не раньше `ttl` секунд назад.
+
+    Временные сбои берутся, только если они моложе
+    `const.LINK_CHECK_FAILURE_TTL`.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        ttl (float): Срок годности результата, секунд.
+
+    Returns:
+        dict: {адрес: (код, перенаправление, задержка, ошибка)}.
+    """
+    now = time.time()
+    failure_ttl = min(ttl, const.LINK_CHECK_FAILURE_TTL)
+    with closing(connect(db_path)) as conn:
+        return {
+            url: tuple(result) for url, *result in conn.execute(
+                'SELECT url, status, target, latency, error FROM links '
+                f'WHERE checked_at >= ? AND ({DEFINITIVE} OR checked_at >= ?)',
+                (now - ttl, now - failure_ttl)
+            )
+        }
+
+
+def save(db_path, checked):
+    """Сохраняет результаты проверки.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        checked (dict): {адрес: (код, перенаправление, задержка, ошибка)}.
+    """
+    checked_at = time.time()
+    with closing(connect(db_path)) as conn, conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                (url, *result, checked_at)
+                for url, result in checked.items()
+            )
+        )
+
+
+def request(session, url, method):
+    """Запрос в обход кеша через лимит хоста, тело не загружается.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Проверяемый адрес.
+        method (str): `HEAD` или `GET`.
+
+    Returns:
+        response(request.Response): Ответ сервера с закрытым соединением.
+    """
+    response = throttle.send(
+        session, url,
+        get=lambda url: fetch.send_uncached(
+            session, url, stream=True, method=method,
+            timeout=const.LINK_CHECK_TIMEOUT
+        )
+    )
+    response.close()
+    return response
+
+
+def check_link(session, url):
+    """Проверяет ссылку запросом HEAD, при ошибке HEAD — запросом GET.
+
+    Часть серверов не поддерживает HEAD (405, 501) или отвечает на него
+    иначе, чем на GET, поэтому любой код ошибки перепроверяется GET.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Проверяемый адрес.
+
+    Returns:
+        tuple(int, str, float, str): Код ответа (0 при ошибке
+            соединения), адрес после перенаправлений, задержка в мс,
+            описание ошибки.
+    """
+    start = time.monotonic()
+    try:
+        response = request(session, url, 'HEAD')
+        if response.status_code >= 400:
+            start = time.monotonic()
+            response = request(session, url, 'GET')
+    except RequestException as error:
+        latency = (time.monotonic() - start) * 1000
+        return 0, '', round(latency, 1), type(error).__name__
+    latency = (time.monotonic() - start) * 1000
+    target = response.url if response.history else ''
+    return response.status_code, target, round(latency, 1), ''
+
+
+def check_links(session, urls, db_path, ttl=const.LINK_CHECK_TTL,
+                workers=const.WORKERS):
+    """Проверяет ссылки одновременно, используя кеш результатов.
+
+    Args:
+        session (request.Session): Объект сессии.
+        urls (list[str]): Проверяемые адреса.
+        db_path (Path): База результатов проверки.
+        ttl (float): Срок годности результата, секунд.
+        workers (int): Начальный лимит одновременных проверок хоста.
+
+    Returns:
+        dict: {адрес: (код, перенаправление, задержка, ошибка)}.
+    """
+    fresh = load_fresh(db_path, ttl)
+    results = {url: fresh[url] for url in urls if url in fresh}
+    stale = [url for url in urls if url not in results]
+    checked = dict(zip(stale, fetch.parallel_map(
+        lambda url: check_link(session, url), stale, workers, url=str
+    )))
+    save(db_path, checked)
+    results.update(checked)
+    logging.info(
+        f'Проверено ссылок: {len(checked)}, '
+        f'взято из кеша проверок: {len(urls) - len(checked)}'
+    )
+    return results
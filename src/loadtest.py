@@ -0,0 +1,431 @@
+"""Нагрузочное тестирование режимов парсера на записанных кассетах.
+
+Локальный HTTP-сервер отдаёт ответы из кассеты (см. `cassette.py`)
+с заданной задержкой, ограничением пропускной способности, ответами
+429/5xx и обрывами соединений. Парсер направляется на сервер через
+транспортный адаптер, поэтому адреса, кеш и лимиты хостов остаются
+теми же, что и при работе с настоящими сайтами.
+
+Запуск:
+    python loadtest.py run pep --cassette pep.jsonl --latency lognormal:80:0.5
+    python loadtest.py serve --cassette pep.jsonl --port 8765
+"""
+import argparse
+import collections
+import logging
+import math
+import random
+import socket
+import struct
+import tempfile
+import threading
+import time
+from argparse import Namespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests_cache
+from requests.adapters import HTTPAdapter
+
+import cassette
+import configs as conf
+import constants as const
+import fetch
+import outputs
+import throttle
+from main import MODE_TO_FUNCTION
+
+Faults = collections.namedtuple(
+    'Faults',
+    ('latency', 'bandwidth', 'throttle_rate', 'error_rate', 'reset_rate',
+     'retry_after'),
+    defaults=(None, None, 0.0, 0.0, 0.0, 0),
+)
+
+
+def parse_latency(spec):
+    """Разбирает распределение задержки ответа.
+
+    Поддерживаются `fixed:MS`, `uniform:MIN_MS:MAX_MS` и
+    `lognormal:MEDIAN_MS:SIGMA`.
+
+    Args:
+        spec (str): Описание распределения.
+
+    Raises:
+        argparse.ArgumentTypeError: Неизвестное распределение.
+
+    Returns:
+        callable: Функция random.Random -> задержка в секундах.
+    """
+    kind, *params = spec.split(':')
+    try:
+        params = [float(param) for param in params]
+        if kind == 'fixed':
+            delay, = params
+            return lambda rng: delay / 1000
+        if kind == 'uniform':
+            low, high = params
+            return lambda rng: rng.uniform(low, high) / 1000
+        if kind == 'lognormal':
+            median, sigma = params
+            mu = math.log(median)
+            return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(
+        f'Неизвестное распределение задержки: {spec}'
+    )
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Отдаёт ответы из кассеты с внесением неисправностей.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.replay(self, send_body=True)
+
+    def do_HEAD(self):
+        self.server.replay(self, send_body=False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Сервер воспроизведения кассеты.
+
+    Адрес исходной страницы передаётся в пути запроса:
+    `http://127.0.0.1:PORT/https://peps.python.org/pep-0008/`.
+    """
+    daemon_threads = True
+
+    def __init__(self, interactions, faults=Faults(), seed=None,
+                 address=('127.0.0.1', 0)):
+        super().__init__(address, ReplayHandler)
+        self.interactions = interactions
+        self.faults = faults
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = collections.Counter()
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def roll(self):
+        """Случайная задержка и вид неисправности для запроса."""
+        faults = self.faults
+        with self.rng_lock:
+            delay = faults.latency(self.rng) if faults.latency else 0
+            roll = self.rng.random()
+        for fault, rate in (
+            ('reset', faults.reset_rate),
+            ('throttle', faults.throttle_rate),
+            ('error', faults.error_rate),
+        ):
+            if roll < rate:
+                return delay, fault
+            roll -= rate
+        return delay, None
+
+    def count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def replay(self, handler, send_body):
+        """Отвечает на запрос из кассеты или вносит неисправность."""
+        delay, fault = self.roll()
+        time.sleep(delay)
+        self.count('requests')
+        if fault == 'reset':
+            self.count('resets')
+            # SO_LINGER с нулевым таймаутом закрывает сокет через RST.
+            handler.connection.setsockopt(
+                socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0)
+            )
+            handler.close_connection = True
+            return
+        if fault == 'throttle':
+            self.count('throttled')
+            self.send(handler, 429, {
+                'Retry-After': str(self.faults.retry_after)
+            }, b'', send_body)
+            return
+        if fault == 'error':
+            self.count('errors')
+            self.send(handler, 503, {}, b'', send_body)
+            return
+
+        interaction = self.lookup(handler.command, handler.path[1:])
+        if interaction is None:
+            self.count('missing')
+            self.send(handler, 404, {}, b'', send_body)
+            return
+        status, headers, body = interaction
+        self.send(handler, status, headers, body, send_body)
+
+    def lookup(self, method, url):
+        """Ответ кассеты на запрос; HEAD без записи берётся из GET."""
+        url = fetch.normalize_url(url)
+        interaction = self.interactions.get((method, url))
+        if interaction is None and method == 'HEAD':
+            interaction = self.interactions.get(('GET', url))
+        return interaction
+
+    def send(self, handler, status, headers, body, send_body):
+        """Отправляет ответ, соблюдая ограничение пропускной способности."""
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if not send_body:
+            return
+        chunk_size = const.STREAM_CHUNK_SIZE
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start:start + chunk_size]
+            handler.wfile.write(chunk)
+            if self.faults.bandwidth:
+                time.sleep(len(chunk) / self.faults.bandwidth)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Направляет все запросы сессии на сервер воспроизведения.
+
+    Время до получения заголовков каждого ответа сохраняется
+    в `latencies`.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+        self.latencies = []
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        request = request.copy()
+        request.url = f'{self.base_url}/{original_url}'
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        self.latencies.append(time.perf_counter() - start)
+        response.url = original_url
+        return response
+
+
+def mount_replay(session, base_url, pool_size=const.MAX_HOST_CONCURRENCY):
+    """Подключает к сессии адаптер воспроизведения.
+
+    Args:
+        session (request.Session): Объект сессии.
+        base_url (str): Адрес сервера воспроизведения.
+        pool_size (int): Размер пула соединений.
+
+    Returns:
+        ReplayAdapter: Подключённый адаптер.
+    """
+    adapter = ReplayAdapter(
+        base_url, pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return adapter
+
+
+def percentile(values, share):
+    """Перцентиль по отсортированному списку значений.
+
+    Args:
+        values (list[float]): Отсортированные значения.
+        share (float): Доля от 0 до 1.
+
+    Returns:
+        float: Значение перцентиля или 0 для пустого списка.
+    """
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, math.ceil(share * len(values)) - 1)
+    return values[max(index, 0)]
+
+
+def run_once(mode_function, base_url, workers):
+    """Один прогон режима через сервер воспроизведения.
+
+    Режим работает во временной директории данных, поэтому базы,
+    журналы и загрузки пользователя не затрагиваются.
+
+    Args:
+        mode_function (callable): Функция режима из `MODE_TO_FUNCTION`.
+        base_url (str): Адрес сервера воспроизведения.
+        workers (int): Начальный лимит одновременных загрузок хоста.
+
+    Returns:
+        tuple(float, list[float], list): Время прогона, задержки
+            ответов в секундах, результаты режима.
+    """
+    session = requests_cache.CachedSession(backend='memory')
+    adapter = mount_replay(session, base_url)
+    throttle.reset()
+    with tempfile.TemporaryDirectory() as base_dir:
+        start = time.perf_counter()
+        results = mode_function(
+            session, Namespace(workers=workers, base_dir=Path(base_dir))
+        )
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(adapter.latencies), results
+
+
+def run(mode_function, interactions, faults=Faults(), repeat=1,
+        workers=const.WORKERS, seed=None):
+    """Нагрузочный прогон режима на кассете.
+
+    Args:
+        mode_function (callable): Функция режима из `MODE_TO_FUNCTION`.
+        interactions (dict): Содержимое кассеты.
+        faults (Faults): Параметры неисправностей.
+        repeat (int): Количество прогонов.
+        workers (int): Начальный лимит одновременных загрузок хоста.
+        seed (int): Зерно генератора неисправностей.
+
+    Returns:
+        results (list[tuple]): Показатели каждого прогона.
+    """
+    server = ReplayServer(interactions, faults, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    results = [(
+        'Прогон', 'Время, с', 'Ответов', 'Ответов/с',
+        'p50, мс', 'p95, мс', 'p99, мс', 'Строк результата'
+    )]
+    try:
+        for number in range(1, repeat + 1):
+            elapsed, latencies, mode_results = run_once(
+                mode_function, server.base_url, workers
+            )
+            results.append((
+                number,
+                round(elapsed, 3),
+                len(latencies),
+                round(len(latencies) / elapsed, 1) if elapsed else 0,
+                round(percentile(latencies, 0.50) * 1000, 1),
+                round(percentile(latencies, 0.95) * 1000, 1),
+                round(percentile(latencies, 0.99) * 1000, 1),
+                len(mode_results) - 1 if mode_results else 0,
+            ))
+    finally:
+        server.shutdown()
+        server.server_close()
+    logging.info(f'Сервер воспроизведения: {dict(server.stats)}')
+    return results
+
+
+def configure_argument_parser(available_modes):
+    parser = argparse.ArgumentParser(
+        description='Нагрузочное тестирование парсера на кассетах'
+    )
+    parser.add_argument(
+        'command',
+        choices=('run', 'serve'),
+        help='Прогон режима или только сервер воспроизведения'
+    )
+    parser.add_argument(
+        'mode',
+        nargs='?',
+        choices=available_modes,
+        help='Режим парсера для команды `run`'
+    )
+    parser.add_argument(
+        '--cassette',
+        type=Path,
+        required=True,
+        help='Кассета, записанная с `main.py --record`'
+    )
+    parser.add_argument(
+        '--latency',
+        type=parse_latency,
+        help='Задержка: fixed:MS, uniform:MIN:MAX, lognormal:MEDIAN:SIGMA'
+    )
+    parser.add_argument(
+        '--bandwidth',
+        type=float,
+        help='Пропускная способность на соединение, байт/с'
+    )
+    parser.add_argument(
+        '--throttle-rate', type=float, default=0.0,
+        help='Доля ответов 429'
+    )
+    parser.add_argument(
+        '--error-rate', type=float, default=0.0,
+        help='Доля ответов 503'
+    )
+    parser.add_argument(
+        '--reset-rate', type=float, default=0.0,
+        help='Доля обрывов соединения'
+    )
+    parser.add_argument(
+        '--retry-after', type=int, default=0,
+        help='Значение Retry-After в ответах 429, секунд'
+    )
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Количество прогонов')
+    parser.add_argument('-w', '--workers', type=int, default=const.WORKERS,
+                        help='Начальное количество одновременных загрузок '
+                        'с одного хоста')
+    parser.add_argument('--seed', type=int,
+                        help='Зерно генератора неисправностей')
+    parser.add_argument('--port', type=int, default=0,
+                        help='Порт сервера для команды `serve`')
+    return parser
+
+
+def parse_arguments(available_modes, argv=None):
+    """Разбирает аргументы командной строки.
+
+    Args:
+        available_modes (list[str]): Режимы парсера, загружающие
+            страницы: `watch` не завершается сам, а офлайн-режимы не
+            обращаются к сети.
+        argv (list[str]): Аргументы. По умолчанию `sys.argv`.
+
+    Returns:
+        Namespace: Разобранные аргументы.
+    """
+    parser = configure_argument_parser(available_modes)
+    args = parser.parse_args(argv)
+    if args.command == 'run' and args.mode is None:
+        parser.error('для команды run укажите режим парсера')
+    return args
+
+
+def main():
+    """Запускает нагрузочный прогон или сервер воспроизведения.
+    """
+    conf.configure_logging()
+    args = parse_arguments(const.LOADTEST_MODES)
+    faults = Faults(
+        args.latency, args.bandwidth, args.throttle_rate, args.error_rate,
+        args.reset_rate, args.retry_after
+    )
+    interactions = cassette.load(args.cassette)
+    if args.command == 'serve':
+        server = ReplayServer(
+            interactions, faults, args.seed, ('127.0.0.1', args.port)
+        )
+        logging.info(f'Сервер воспроизведения: {server.base_url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+        return
+    results = run(
+        MODE_TO_FUNCTION[args.mode], interactions, faults, args.repeat,
+        args.workers, args.seed
+    )
+    outputs.pretty_output(results)
+
+
+if __name__ == '__main__':
+    main()
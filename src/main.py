@@ -4,26 +4,100 @@ import re
 from urllib.parse import urljoin
 
 import requests_cache
-from tqdm import tqdm
+from bs4 import SoupStrainer
 
+import archives
+import bundle
+import cassette
 import configs as conf
 import constants as const
+import fetch
+import history
+import journal
+import linkcheck
+import memory
 import outputs
+import pepdb
+import progress
+import records
+import shards
 import utils
+import watcher
+from exceptions import (
+    BundleException, HistoryException, JournalException,
+    PepDatabaseException, ShardException
+)
 
 BASE_DIR = const.BASE_DIR
 
 
-def whats_new(session):
+def whats_new(session, cli_args=None):
     """Собирает ссылки на статьи о нововведениях в Python.
 
     Args:
        session (request.Session): Объект сессии.
+       cli_args (Namespace): Управляющие аргументы.
 
     Returns:
         results (list[tuple]): Список с ссылками и авторами.
         None: При ошибке загрузки страницы.
     """
+    with memory.stage('оглавление What`s New'):
+        links = whats_new_links(session)
+    if links is None:
+        return None
+
+    results = [records.WhatsNewArticle.HEADER]
+    with memory.stage('статьи What`s New'), \
+            open_journal(cli_args, 'whats-new') as run_journal:
+        articles = run_journal.replay(links, fetch.parallel_map(
+            lambda link: utils.view_whats_new_page(link, session),
+            run_journal.pending(links),
+            getattr(cli_args, 'workers', const.WORKERS),
+            url=str
+        ))
+        for full_link, article in progress.track(
+            zip(links, articles), len(links), 'статьи What`s New'
+        ):
+            if article is None:
+                continue
+            h1_text, dl_text = article
+            results.append(
+                records.WhatsNewArticle(full_link, h1_text, dl_text)
+            )
+    run_journal.commit()
+    return results
+
+
+def open_journal(cli_args, mode):
+    """Открывает журнал прогона режима; у каждого шарда — свой журнал.
+
+    Args:
+        cli_args (Namespace): Управляющие аргументы.
+        mode (str): Режим работы парсера.
+
+    Returns:
+        journal.Journal: Журнал, продолжающий прежний при `--resume`.
+    """
+    shard = getattr(cli_args, 'shard', None)
+    if shard is not None:
+        mode = '{}-{}-of-{}'.format(mode, *shard)
+    return journal.Journal(
+        get_base_dir(cli_args) / const.JOURNAL_DIR / f'{mode}.jsonl',
+        getattr(cli_args, 'resume', False)
+    )
+
+
+def whats_new_links(session):
+    """Собирает ссылки на статьи о нововведениях со страницы-оглавления.
+
+    Args:
+        session (request.Session): Объект сессии.
+
+    Returns:
+        list[str]: Адреса статей.
+        None: При ошибке загрузки страницы.
+    """
     whats_new_url = urljoin(const.MAIN_DOC_URL, 'whatsnew/')
     soup = utils.make_soup(whats_new_url, session)
     if soup is None:
@@ -33,104 +107,281 @@ def whats_new(session):
     sections_by_python = div_with_ul.find_all(
         'li', attrs={'class': 'toctree-l1'}
     )
+    links = [
+        urljoin(whats_new_url, utils.find_tag(section, 'a')['href'])
+        for section in sections_by_python
+    ]
+    utils.decompose(soup)
+    return links
 
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, Aвтор')]
-    for section in tqdm(sections_by_python, colour='green'):
-        link = utils.find_tag(section, 'a')
-        link = link['href']
-        full_link = urljoin(whats_new_url, link)
-        soup = utils.make_soup(full_link, session)
-        if soup is None:
-            continue
-        h1 = utils.find_tag(soup, 'h1')
-        h1_text = h1.text
-        dl = utils.find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
-        results.append((full_link, h1_text, dl_text))
 
+def latest_versions(session, cli_args=None):
+    """Собирает статусы и ссылки на документацию последних версий Python.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Raises:
+        Exception: Некорректные настройки парсера для поиска.
+
+    Returns:
+        results (list[tuple]): Список ссылок на документацию.
+        None: При ошибке загрузки страницы.
+    """
+    soup = utils.make_soup(const.MAIN_DOC_URL, session)
+    if soup is None:
+        return None
+    results = [records.VersionLink.HEADER]
+    results.extend(utils.parse_versions(soup))
+    utils.decompose(soup)
     return results
 
 
-def latest_versions(session):
-    """Собирает статусы и ссылки на документацию последних версий Python.
+def version_matrix(session, cli_args=None):
+    """Собирает сведения о каждой документированной версии Python.
+
+    Корневые страницы, «What's New» и страницы загрузки всех версий
+    загружаются одновременно через общую сессию, поэтому время
+    работы определяется самой медленной страницей, а не их суммой.
 
     Args:
         session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
 
     Raises:
         Exception: Некорректные настройки парсера для поиска.
 
     Returns:
-        results (list[tuple]): Список ссылок на документацию.
+        results (list[tuple]): Таблица сведений по версиям.
         None: При ошибке загрузки страницы.
     """
     soup = utils.make_soup(const.MAIN_DOC_URL, session)
     if soup is None:
         return None
-    sidebar = utils.find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
-    ul_tags = sidebar.find_all('ul')
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all('a')
-            break
-    else:
-        raise Exception('Ничего не нашлось')
-
-    results = [('Ссылка на документацию', 'Версия', 'Статус')]
-    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
-    for a_tag in a_tags:
-        link = a_tag['href']
-        text_match = re.search(pattern, a_tag.text)
-        if text_match is not None:
-            version, status = text_match.groups()
-        else:
-            version, status = a_tag.text, ''
-        results.append(
-            (link, version, status)
+    versions = [
+        (urljoin(const.MAIN_DOC_URL, link), version, status)
+        for link, version, status in utils.parse_versions(soup)
+        if re.fullmatch(r'\d+\.\d+', version)
+    ]
+    utils.decompose(soup)
+    tasks = [
+        (kind, url)
+        for link, version, _ in versions
+        for kind, url in version_pages(link, version).items()
+    ]
+    pages = dict(zip(tasks, fetch.parallel_map(
+        lambda task: utils.view_version_page(*task, session),
+        tasks,
+        getattr(cli_args, 'workers', const.WORKERS),
+        url=lambda task: task[1]
+    )))
+
+    results = [records.VersionFacts.HEADER]
+    for link, version, status in versions:
+        root, whats_new_title, archive_list = (
+            pages[task] for task in version_pages(link, version).items()
         )
-
+        results.append(records.VersionFacts(
+            version,
+            status,
+            root or '',
+            whats_new_title or '',
+            ', '.join(
+                f'{archive_format} {size}'.strip()
+                for archive_format, _, size in archive_list or ()
+            ),
+        ))
     return results
 
 
-def download(session):
-    """Загружает документацию (pdf) последней версии Python.
+def version_pages(link, version):
+    """Адреса страниц версии Python, которые посещает `version-matrix`.
+
+    Args:
+        link (str): Адрес корневой страницы документации версии.
+        version (str): Номер версии, например `3.12`.
+
+    Returns:
+        dict: {вид страницы: адрес}.
+    """
+    return {
+        'root': link,
+        'whats-new': urljoin(link, f'whatsnew/{version}.html'),
+        'download': urljoin(link, 'download.html'),
+    }
+
+
+def download(session, cli_args=None):
+    """Загружает архивы документации последней версии Python.
+
+    Архивы форматов из `--formats` загружаются одновременно;
+    не изменившиеся с прошлого запуска пропускаются по манифесту.
 
     Args:
         session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
     """
     downloads_url = urljoin(const.MAIN_DOC_URL, 'download.html')
     soup = utils.make_soup(downloads_url, session)
     if soup is None:
         return None
 
-    table = utils.find_tag(soup, 'table')
-    pdf = utils.find_tag(table, 'a', {'href': re.compile(r'.+pdf-a4\.zip$')})
-    pdf_link = pdf['href']
-    pdf_url = urljoin(downloads_url, pdf_link)
-    filename = pdf_url.split('/')[-1]
-    downloads_dir = BASE_DIR / 'downloads'
+    formats = getattr(cli_args, 'formats', None) or const.DOWNLOAD_FORMATS
+    links = {
+        archive_format: url
+        for archive_format, url, _ in utils.parse_archives(soup, downloads_url)
+        if archive_format in formats
+    }
+    utils.decompose(soup)
+    for archive_format in set(formats) - set(links):
+        logging.warning(f'На странице загрузки нет архива {archive_format}')
+
+    downloads_dir = get_base_dir(cli_args) / 'downloads'
     downloads_dir.mkdir(exist_ok=True)
-    zip_path = downloads_dir / filename
+    manifest_path = downloads_dir / const.DOWNLOAD_MANIFEST
+    manifest = utils.load_json(manifest_path)
+    downloaded = fetch.parallel_map(
+        lambda url: archives.download_archive(
+            session, url, downloads_dir, manifest.get(url.split('/')[-1])
+        ),
+        list(links.values()),
+        getattr(cli_args, 'workers', const.WORKERS),
+        url=str
+    )
+    for url, (outcome, entry) in zip(links.values(), downloaded):
+        filename = url.split('/')[-1]
+        if entry is not None:
+            manifest[filename] = entry
+        logging.info(f'Архив {downloads_dir / filename}: {outcome}')
+    utils.save_json(manifest_path, manifest)
+    return None
 
-    responce = session.get(pdf_url)
-    with open(zip_path, 'wb') as file:
-        file.write(responce.content)
 
-    logging.info(f'Архив был загружен и сохранён: {zip_path}')
-    return None
+def link_check(session, cli_args=None):
+    """Проверяет все ссылки из статей о нововведениях в Python.
 
+    Ссылки проверяются одновременно запросами HEAD (с откатом на GET)
+    в пределах лимитов каждого хоста; результаты кешируются на
+    `--ttl` секунд. Неработающие ссылки выводятся первыми.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
 
-def pep(session):
+    Returns:
+        results (list[tuple]): Код ответа, перенаправление и задержка
+            для каждой ссылки.
+        None: При ошибке загрузки страницы.
+    """
+    articles = whats_new_links(session)
+    if articles is None:
+        return None
+    workers = getattr(cli_args, 'workers', const.WORKERS)
+    sources = {}
+    for article, links in zip(articles, fetch.parallel_map(
+        lambda article: utils.page_links(article, session), articles, workers,
+        url=str
+    )):
+        for link in links or ():
+            sources.setdefault(link, article)
+
+    checked = linkcheck.check_links(
+        session,
+        list(sources),
+        get_base_dir(cli_args) / const.LINK_CHECK_DB,
+        getattr(cli_args, 'ttl', const.LINK_CHECK_TTL),
+        workers
+    )
+    rows = sorted(
+        (
+            records.LinkStatus(url, *checked[url], article)
+            for url, article in sources.items()
+        ),
+        key=lambda row: (200 <= row.status < 400, row.url)
+    )
+    return [records.LinkStatus.HEADER, *rows]
+
+
+def pep(session, cli_args=None):
     """Проверяет и подсчитывает статусы PEP`ов и их количество.
 
+    При заданном `--shard i/N` обрабатывается только часть индекса,
+    а частичные результаты сохраняются в файл шарда. Поля шапок всех
+    PEP`ов сохраняются в базу метаданных для режима `pep-query`.
+
     Args:
         session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
 
     Returns:
         results (list[tuple]): Список со статусами PEP`ов.
         None: При ошибке загрузки страницы.
     """
-    soup = utils.make_soup(const.PEP_DOC_URL, session)
+    shard = getattr(cli_args, 'shard', None)
+    with memory.stage('индекс PEP'):
+        pages = pep_pages(session, shard)
+    if pages is None:
+        return None
+    urls = [page_url for page_url, _ in pages]
+
+    total_by_status = collections.defaultdict(int)
+    mismatches = []
+    peps = []
+    with memory.stage('страницы PEP'), \
+            open_journal(cli_args, 'pep') as run_journal:
+        headers = run_journal.replay(urls, fetch.parallel_map(
+            lambda url: utils.view_pep_page(url, session),
+            run_journal.pending(urls),
+            getattr(cli_args, 'workers', const.WORKERS),
+            url=str
+        ))
+        for (page_url, type_status_in_table), fields in progress.track(
+            zip(pages, headers), len(pages), 'страницы PEP'
+        ):
+            if fields is None:
+                logging.warning(
+                    f'Не удалось просмотреть страницу:\n{page_url}'
+                )
+                continue
+
+            peps.append((page_url, fields))
+            page_status = fields.get('Status', '')
+            total_by_status[page_status] += 1
+            if not utils.check_status(
+                page_status, type_status_in_table, page_url
+            ):
+                mismatches.append({
+                    'url': page_url,
+                    'page_status': page_status,
+                    'table_status': type_status_in_table,
+                })
+
+    with memory.stage('база метаданных PEP'):
+        pepdb.save_peps(get_base_dir(cli_args) / const.PEP_DB, peps)
+    if shard is not None:
+        shards.write_shard(
+            get_shard_dir(cli_args), *shard, total_by_status, mismatches
+        )
+    run_journal.commit()
+    return status_results(total_by_status)
+
+
+def pep_pages(session, shard=None):
+    """Собирает адреса страниц PEP`ов и их статусы в индексе.
+
+    Args:
+        session (request.Session): Объект сессии.
+        shard (tuple(int, int)): Номер шарда и количество шардов.
+
+    Returns:
+        list[tuple]: Адрес страницы PEP`а, тип и статус в таблице.
+        None: При ошибке загрузки страницы.
+    """
+    soup = utils.make_soup(
+        const.PEP_DOC_URL, session,
+        SoupStrainer('section', attrs={'id': 'numerical-index'})
+    )
     if soup is None:
         return None
 
@@ -138,41 +389,280 @@ def pep(session):
     index_body = utils.find_tag(pep_index, 'tbody')
     index_rows = index_body.find_all('tr')
 
-    total_by_status = collections.defaultdict(int)
-    results = [('Статус', 'Количество')]
-    for row in tqdm(index_rows, colour='blue'):
+    pages = []
+    for row in index_rows:
         td_tag = utils.find_tag(row, 'td')
         type_status_in_table = td_tag.text
 
         link = utils.find_tag(row, 'a')
         link = link['href']
-        page_url = urljoin(const.PEP_DOC_URL, link)
-
-        type_status_on_page = utils.view_pep_page(page_url, session)
-        if type_status_on_page is None:
-            logging.warning(
-                f'Не удалось просмотреть страницу:\n{page_url}'
-            )
+        if shard is not None and not shards.in_shard(link, *shard):
             continue
+        pages.append((urljoin(const.PEP_DOC_URL, link), type_status_in_table))
+    utils.decompose(soup)
+    return pages
+
+
+def merge(session, cli_args=None):
+    """Объединяет файлы шардов режима `pep` в итоговую таблицу.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        results (list[tuple]): Список со статусами PEP`ов.
+    """
+    total_by_status, mismatches = shards.merge_shards(
+        get_shard_dir(cli_args)
+    )
+    for mismatch in mismatches:
+        logging.info(f'Несовпадающие статусы:\n{mismatch["url"]}')
+    return status_results(total_by_status)
+
+
+def get_base_dir(cli_args):
+    """Директория данных прогона: баз, журналов, шардов и загрузок.
+
+    Нагрузочные прогоны передают свою временную директорию, чтобы не
+    затрагивать данные пользователя.
+
+    Args:
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        Path: Путь к директории.
+    """
+    return getattr(cli_args, 'base_dir', None) or BASE_DIR
 
-        _, page_status = type_status_on_page
-        total_by_status[page_status] += 1
-        utils.check_status(page_status, type_status_in_table, page_url)
 
+def get_shard_dir(cli_args):
+    """Директория для файлов шардов.
+
+    Args:
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        Path: Путь к директории.
+    """
+    shard_dir = getattr(cli_args, 'shard_dir', None)
+    return shard_dir or get_base_dir(cli_args) / 'shards'
+
+
+def status_results(total_by_status):
+    """Собирает таблицу с количеством PEP`ов по статусам.
+
+    Args:
+        total_by_status (dict): Количество PEP`ов по статусам.
+
+    Returns:
+        results (list[tuple]): Список со статусами PEP`ов.
+    """
+    results = [records.StatusCount.HEADER]
     total = 0
     for key, value in total_by_status.items():
-        results.append((key, value))
+        results.append(records.StatusCount(key, value))
         total += value
-    results.append(('Total', total))
+    results.append(records.StatusCount('Total', total))
+    return results
+
+
+def pep_query(session, cli_args=None):
+    """Отвечает на запросы к базе метаданных PEP`ов без обращения к сети.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        results (list[tuple]): Найденные PEP`ы или количество по группам.
+    """
+    return pepdb.query(
+        get_base_dir(cli_args) / const.PEP_DB,
+        getattr(cli_args, 'where', None) or (),
+        getattr(cli_args, 'group_by', None)
+    )
 
+
+def diff(session, cli_args=None):
+    """Сравнивает два прогона режима из истории.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        results (list[tuple]): Добавленные, удалённые и изменённые строки.
+    """
+    return history.diff_runs(
+        get_base_dir(cli_args) / const.HISTORY_DB,
+        getattr(cli_args, 'target', None) or 'pep',
+        getattr(cli_args, 'runs', None)
+    )
+
+
+def show_history(session, cli_args=None):
+    """Перечисляет сохранённые прогоны режима.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        results (list[tuple]): Номера, время и размер прогонов.
+    """
+    results = [records.HistoryRun.HEADER]
+    results.extend(history.list_runs(
+        get_base_dir(cli_args) / const.HISTORY_DB,
+        getattr(cli_args, 'target', None) or 'pep'
+    ))
     return results
 
 
+def watch(session, cli_args=None):
+    """Отслеживает появление версий Python и смену их статусов.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+    """
+    watcher.watch(
+        session,
+        const.MAIN_DOC_URL,
+        get_base_dir(cli_args) / const.WATCH_STATE,
+        interval=getattr(cli_args, 'interval', const.WATCH_INTERVAL),
+        iterations=getattr(cli_args, 'iterations', 0),
+        events_file=getattr(cli_args, 'events_file', None)
+    )
+    return None
+
+
+def get_bundle_path(cli_args):
+    """Путь к архиву кешей.
+
+    Args:
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        Path: Путь к архиву.
+    """
+    bundle_path = getattr(cli_args, 'bundle', None)
+    return bundle_path or get_base_dir(cli_args) / const.BUNDLE_NAME
+
+
+def cache_export(session, cli_args=None):
+    """Упаковывает HTTP-кеш и кеши результатов в переносимый архив.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+    """
+    bundle.export_bundle(
+        bundle.bundle_databases(session, get_base_dir(cli_args)),
+        get_bundle_path(cli_args)
+    )
+    return None
+
+
+def cache_import(session, cli_args=None):
+    """Объединяет кеши из архива с локальными.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+    """
+    bundle.import_bundle(
+        bundle.bundle_databases(session, get_base_dir(cli_args)),
+        get_bundle_path(cli_args)
+    )
+    return None
+
+
+def prefetch_urls(session, mode):
+    """Определяет все адреса, которые понадобятся режиму.
+
+    Args:
+        session (request.Session): Объект сессии.
+        mode (str): Режим работы парсера.
+
+    Returns:
+        list[str]: Адреса страниц.
+        None: При ошибке загрузки страницы.
+    """
+    if mode == 'latest-versions':
+        return [const.MAIN_DOC_URL]
+    if mode == 'download':
+        return [urljoin(const.MAIN_DOC_URL, 'download.html')]
+    if mode == 'whats-new':
+        return whats_new_links(session)
+    pages = pep_pages(session)
+    return None if pages is None else [page_url for page_url, _ in pages]
+
+
+def cache_prefetch(session, cli_args=None):
+    """Заранее загружает в кеш все страницы, нужные режиму.
+
+    Args:
+        session (request.Session): Объект сессии.
+        cli_args (Namespace): Управляющие аргументы.
+
+    Returns:
+        results (list[tuple]): Количество загруженных адресов.
+        None: При ошибке загрузки страницы.
+    """
+    mode = getattr(cli_args, 'target', None) or 'pep'
+    urls = prefetch_urls(session, mode)
+    if urls is None:
+        return None
+    responses = fetch.parallel_map(
+        lambda url: utils.get_response(session, url),
+        urls,
+        getattr(cli_args, 'workers', const.WORKERS),
+        url=str
+    )
+    loaded = failed = 0
+    for response in progress.track(responses, len(urls), 'предзагрузка'):
+        if response is not None and response.ok:
+            loaded += 1
+        else:
+            failed += 1
+    return [
+        records.PrefetchSummary.HEADER,
+        records.PrefetchSummary(mode, len(urls), loaded, failed),
+    ]
+
+
+def save_history(results, cli_args):
+    """Сохраняет результаты прогона в историю, если режим её ведёт.
+
+    Args:
+        results (list[tuple]): Результаты работы парсера.
+        cli_args (Namespace): Управляющие аргументы.
+    """
+    history_mode = const.HISTORY_MODES.get(cli_args.mode)
+    if history_mode is None or getattr(cli_args, 'shard', None):
+        return
+    run_id = history.save_run(
+        get_base_dir(cli_args) / const.HISTORY_DB, history_mode, results
+    )
+    logging.info(f'Прогон {history_mode} сохранён в истории под №{run_id}')
+
+
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
     'pep': pep,
     'download': download,
+    'version-matrix': version_matrix,
+    'merge': merge,
+    'pep-query': pep_query,
+    'link-check': link_check,
+    'diff': diff,
+    'history': show_history,
+    'watch': watch,
+    'cache-export': cache_export,
+    'cache-import': cache_import,
+    'cache-prefetch': cache_prefetch,
 }
 
 
@@ -184,19 +674,39 @@ def main():
 
     arg_parser = conf.configure_argument_parser(MODE_TO_FUNCTION.keys())
     args = arg_parser.parse_args()
+    conf.check_target(arg_parser, args)
     logging.info(f'Аргументы командной строки: {args}')
 
     session = requests_cache.CachedSession()
+    fetch.mount_pool(session)
 
     if args.clear_cache:
         session.cache.clear()
+    if args.record:
+        cassette.record(session, args.record)
+    if args.memory_report:
+        memory.start()
+    progress.configure(args.progress, get_base_dir(args) / args.progress_file)
     parser_mode = args.mode
 
-    results = MODE_TO_FUNCTION[parser_mode](session)
+    try:
+        with memory.stage(parser_mode):
+            results = MODE_TO_FUNCTION[parser_mode](session, args)
+    except (
+        BundleException, HistoryException, JournalException,
+        PepDatabaseException, ShardException
+    ) as error:
+        logging.error(error)
+        results = None
 
     if results is not None:
-        outputs.control_output(results, args)
+        with memory.stage('история'):
+            save_history(results, args)
+        with memory.stage('вывод'):
+            outputs.control_output(results, args)
 
+    fetch.log_stats()
+    memory.report()
     logging.info('Парсер завершил работу.')
 
 
@@ -0,0 +1,65 @@
+"""Отчёт о пиковом потреблении памяти по стадиям работы парсера.
+
+Включается аргументом `--memory-report`; без него стадии ничего
+не измеряют. Для каждой стадии запоминается пик выделенной Python
+памяти (с учётом вложенных стадий) и места выделения, давшие
+наибольший прирост удерживаемой памяти.
+"""
+import contextlib
+import logging
+import tracemalloc
+
+import constants as const
+
+STAGES = []
+
+_peaks = []
+
+
+def start():
+    """Включает отслеживание выделений памяти.
+    """
+    STAGES.clear()
+    tracemalloc.start()
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Измеряет пик памяти и прирост по местам выделения в стадии.
+
+    Args:
+        name (str): Название стадии для отчёта.
+    """
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    if _peaks:
+        _peaks[-1] = max(_peaks[-1], tracemalloc.get_traced_memory()[1])
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    _peaks.append(0)
+    try:
+        yield
+    finally:
+        peak = max(_peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if _peaks:
+            _peaks[-1] = max(_peaks[-1], peak)
+        top = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+        STAGES.append((name, peak, top[:const.MEMORY_TOP_SITES]))
+
+
+def report():
+    """Записывает в лог пик памяти и основные места выделения по стадиям.
+    """
+    if not tracemalloc.is_tracing():
+        return
+    for name, peak, top in STAGES:
+        logging.info(f'Стадия «{name}»: пик памяти {peak / 2 ** 20:.1f} МиБ')
+        for stat in top:
+            frame = stat.traceback[0]
+            logging.info(
+                f'    {frame.filename}:{frame.lineno}: '
+                f'{stat.size_diff / 2 ** 10:+.1f} КиБ, '
+                f'удерживается {stat.size / 2 ** 10:.1f} КиБ'
+            )
+    tracemalloc.stop()
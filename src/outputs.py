@@ -1,13 +1,19 @@
 import csv
 import datetime as dt
+import itertools
 import logging
+import sys
+import typing
 
-from prettytable import PrettyTable
+import wcwidth
 
 import constants as const
+import records
 
 BASE_DIR = const.BASE_DIR
 
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
 
 def control_output(results, cli_args):
     """Управляет выводом результата работы парсера.
@@ -18,8 +24,10 @@ def control_output(results, cli_args):
     """
     if cli_args.output == 'file':
         file_output(results, cli_args)
+    elif cli_args.output in COLUMNAR_FORMATS:
+        columnar_output(results, cli_args)
     elif cli_args.output == 'pretty':
-        pretty_output(results)
+        pretty_output(results, getattr(cli_args, 'page_size', None))
     else:
         default_output(results)
 
@@ -35,17 +43,131 @@ def default_output(results):
         print(*row)
 
 
-def pretty_output(results):
+def pretty_output(results, page_size=None):
     """Выводит результаты работы парсера в терминал в виде таблицы.
 
+    Строки выводятся по мере поступления: ширина столбцов
+    определяется по первым `const.TABLE_SAMPLE_SIZE` строкам, а не
+    помещающиеся в неё значения переносятся. Память не зависит
+    от количества строк.
+
     Args:
-        results (list): Список с результатми работы парсера.
+        results (iterable): Заголовок и строки результатов парсера.
+        page_size (int): Строк на страницу при выводе в терминал.
+                                  Defaults to None.
+    """
+    rows = iter(results)
+    header = next(rows)
+    sample = list(itertools.islice(rows, const.TABLE_SAMPLE_SIZE))
+    widths = column_widths([header] + sample)
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    print(border)
+    print(format_row(header, widths))
+    print(border)
+    paging = page_size and sys.stdin.isatty() and sys.stdout.isatty()
+    for number, row in enumerate(itertools.chain(sample, rows), 1):
+        print(format_row(row, widths))
+        if paging and number % page_size == 0 and not next_page():
+            break
+    print(border)
+
+
+def column_widths(rows):
+    """Ширина столбцов по образцу строк.
+
+    Args:
+        rows (list[tuple]): Образец строк таблицы.
+
+    Returns:
+        list[int]: Ширина каждого столбца.
+    """
+    widths = [0] * len(rows[0])
+    for row in rows:
+        for index, value in enumerate(row):
+            for line in str(value).splitlines() or ['']:
+                widths[index] = max(widths[index], display_width(line))
+    return [min(width, const.TABLE_MAX_COLUMN_WIDTH) for width in widths]
+
+
+def display_width(text):
+    """Ширина текста в терминале с учётом широких символов (CJK, эмодзи).
+
+    Args:
+        text (str): Текст без переносов строк.
+
+    Returns:
+        int: Количество занимаемых колонок терминала.
+    """
+    width = wcwidth.wcswidth(text)
+    return width if width >= 0 else len(text)
+
+
+def wrap_line(line, width):
+    """Разбивает строку на части не шире `width` колонок терминала.
+
+    Args:
+        line (str): Текст без переносов строк.
+        width (int): Ширина столбца.
+
+    Returns:
+        list[str]: Части строки.
     """
-    table = PrettyTable()
-    table.field_names = results[0]
-    table.align = 'l'
-    table.add_rows(results[1:])
-    print(table)
+    parts = ['']
+    used = 0
+    for char in line:
+        char_width = max(wcwidth.wcwidth(char), 0)
+        if used + char_width > width and parts[-1]:
+            parts.append('')
+            used = 0
+        parts[-1] += char
+        used += char_width
+    return parts
+
+
+def format_row(row, widths):
+    """Форматирует строку таблицы, перенося длинные значения.
+
+    Args:
+        row (tuple): Строка результатов.
+        widths (list[int]): Ширина столбцов.
+
+    Returns:
+        str: Одна или несколько строк текста таблицы.
+    """
+    cells = []
+    for value, width in zip(row, widths):
+        lines = []
+        for line in str(value).splitlines() or ['']:
+            lines.extend(wrap_line(line, width))
+        cells.append(lines)
+    height = max(len(lines) for lines in cells)
+    return '\n'.join(
+        '| ' + ' | '.join(
+            pad(lines[index] if index < len(lines) else '', width)
+            for lines, width in zip(cells, widths)
+        ) + ' |'
+        for index in range(height)
+    )
+
+
+def pad(text, width):
+    """Дополняет текст пробелами до ширины столбца в колонках терминала.
+    """
+    return text + ' ' * (width - display_width(text))
+
+
+def next_page():
+    """Ждёт команды пользователя перед следующей страницей таблицы.
+
+    Returns:
+        bool: False, если пользователь прервал вывод.
+    """
+    try:
+        answer = input('-- Enter: далее, q: выход --')
+    except EOFError:
+        return False
+    return answer.strip().lower() != 'q'
 
 
 def file_output(results, cli_args):
@@ -55,15 +177,111 @@ def file_output(results, cli_args):
         results (list): Список с результатми работы парсера.
         cli_args (Namespace): Управляющие аргументы.
     """
+    file_path = result_path(cli_args, 'csv')
+    with open(file=file_path, mode='w', encoding='utf-8') as f:
+        writer = csv.writer(f, dialect='unix')
+        writer.writerows(results)
+
+    logging.info(f'Файл с результатами был сохранён: {file_path}')
+
+
+def result_path(cli_args, suffix):
+    """Путь к файлу результатов режима в директории `results`.
+
+    Args:
+        cli_args (Namespace): Управляющие аргументы.
+        suffix (str): Расширение файла.
+
+    Returns:
+        Path: Путь к файлу.
+    """
     results_dir = BASE_DIR / 'results'
     results_dir.mkdir(exist_ok=True)
     parser_mode = cli_args.mode
     now = dt.datetime.now()
     now = now.strftime(const.DATETIME_FORMAT)
-    file_name = f'{parser_mode}_{now}.csv'
-    file_path = results_dir / file_name
-    with open(file=file_path, mode='w', encoding='utf-8') as f:
-        writer = csv.writer(f, dialect='unix')
-        writer.writerows(results)
+    return results_dir / f'{parser_mode}_{now}.{suffix}'
+
+
+def arrow_schema(pa, header, record, sample):
+    """Схема столбцов Arrow для результатов.
+
+    Типы столбцов берутся из аннотаций записи `records`; для
+    нетипизированных строк они определяются по значениям образца.
+
+    Args:
+        pa (module): Модуль `pyarrow`.
+        header (tuple): Заголовок результатов.
+        record (type): Класс записи или None.
+        sample (list[tuple]): Первые строки результатов.
+
+    Returns:
+        pyarrow.Schema: Схема с заголовком таблицы в метаданных.
+    """
+    metadata = {'header': '\t'.join(map(str, header))}
+    if record is None:
+        table = pa.Table.from_pylist(
+            [dict(zip(map(str, header), row)) for row in sample]
+        )
+        return table.schema.with_metadata(metadata)
+    types = {str: pa.string(), int: pa.int64(), float: pa.float64()}
+    fields = []
+    for name, hint in typing.get_type_hints(record).items():
+        hint, *_ = [
+            arg for arg in typing.get_args(hint) or (hint,)
+            if arg is not type(None)
+        ]
+        fields.append(pa.field(name, types[hint]))
+    return pa.schema(fields, metadata=metadata)
+
+
+def columnar_output(results, cli_args):
+    """Сохраняет результаты в колоночный файл Parquet или Arrow IPC.
+
+    Строки записываются пакетами по `const.COLUMNAR_BATCH_SIZE`,
+    типы столбцов сохраняются (числа не превращаются в строки, как
+    в CSV). Требует необязательную зависимость `pyarrow`; без неё
+    результаты сохраняются в CSV.
+
+    Args:
+        results (iterable): Заголовок и строки результатов парсера.
+        cli_args (Namespace): Управляющие аргументы.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        logging.error(
+            'Для вывода parquet/arrow установите pyarrow; '
+            'результаты будут сохранены в CSV'
+        )
+        file_output(results, cli_args)
+        return
+    rows = iter(results)
+    header = next(rows)
+    batch = list(itertools.islice(rows, const.COLUMNAR_BATCH_SIZE))
+    if batch:
+        record = type(batch[0]) if hasattr(batch[0], '_fields') else None
+    else:
+        record = records.SCHEMAS.get(cli_args.mode)
+    batch_schema = arrow_schema(pa, header, record, batch)
+    file_path = result_path(cli_args, cli_args.output)
+    if cli_args.output == 'parquet':
+        writer = pq.ParquetWriter(file_path, batch_schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_file(
+            file_path, batch_schema,
+            options=pa.ipc.IpcWriteOptions(compression='zstd')
+        )
+    with writer:
+        while batch:
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [
+                    pa.array(column, type=field.type)
+                    for column, field in zip(zip(*batch), batch_schema)
+                ],
+                schema=batch_schema
+            ))
+            batch = list(itertools.islice(rows, const.COLUMNAR_BATCH_SIZE))
 
     logging.info(f'Файл с результатами был сохранён: {file_path}')
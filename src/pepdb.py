@@ -0,0 +1,180 @@
+"""Локальная база метаданных PEP`ов для запросов без обращения к сети.
+
+Каждое поле шапки PEP`а хранится отдельной строкой таблицы `fields`;
+поля со списками (авторы, Requires, Python-Version и т. п.)
+разбиваются на значения. Индекс (name, value, number) покрывает
+фильтры и группировки режима `pep-query`.
+"""
+import datetime as dt
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+import constants as const
+import records
+from exceptions import PepDatabaseException
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS peps (
+    number INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    number INTEGER NOT NULL REFERENCES peps (number) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (number, name, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fields_name_value
+    ON fields (name, value, number);
+"""
+
+FILTER = 'p.number IN (SELECT number FROM fields WHERE name = ? AND value = ?)'
+
+LIST_COLUMNS = ('Type', 'Status', 'Python-Version')
+
+
+def connect(db_path):
+    """Открывает базу метаданных и создаёт схему при необходимости.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+
+    Returns:
+        sqlite3.Connection: Соединение с базой.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def split_values(name, value):
+    """Разбивает значение поля-списка на отдельные значения.
+
+    Args:
+        name (str): Поле шапки.
+        value (str): Значение поля.
+
+    Returns:
+        list[str]: Значения поля.
+    """
+    if name not in const.PEP_LIST_FIELDS:
+        return [value]
+    return [item for item in re.split(r'\s*,\s*', value) if item]
+
+
+def pep_number(url):
+    """Номер PEP`а по адресу его страницы.
+
+    Args:
+        url (str): Адрес страницы PEP`а.
+
+    Returns:
+        int: Номер PEP`а.
+        None: Адрес не похож на страницу PEP`а.
+    """
+    match = re.search(r'pep-(\d+)', url)
+    return int(match.group(1)) if match is not None else None
+
+
+def save_peps(db_path, peps):
+    """Сохраняет поля шапок PEP`ов, заменяя прежние значения.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        peps (list[tuple]): Адрес страницы PEP`а и его поля.
+
+    Returns:
+        int: Количество сохранённых PEP`ов.
+    """
+    updated_at = dt.datetime.now().isoformat(timespec='seconds')
+    saved = 0
+    with closing(connect(db_path)) as conn, conn:
+        for url, fields in peps:
+            number = pep_number(url)
+            if number is None:
+                continue
+            fields = dict(fields)
+            title = fields.pop('Title', '')
+            conn.execute('DELETE FROM fields WHERE number = ?', (number,))
+            conn.execute(
+                'INSERT OR REPLACE INTO peps VALUES (?, ?, ?, ?)',
+                (number, url, title, updated_at)
+            )
+            conn.executemany(
+                'INSERT INTO fields VALUES (?, ?, ?, ?)',
+                [
+                    (number, name, position, value)
+                    for name, field_value in fields.items()
+                    for position, value in enumerate(
+                        split_values(name, field_value)
+                    )
+                ]
+            )
+            saved += 1
+    logging.info(f'Метаданные {saved} PEP`ов сохранены в базу: {db_path}')
+    return saved
+
+
+def column(name):
+    """Подзапрос значений поля для строки PEP`а в выборке.
+    """
+    return (
+        "(SELECT group_concat(value, ', ') FROM fields "
+        f"WHERE number = p.number AND name = '{name}')"
+    )
+
+
+def query(db_path, where=(), group_by=None):
+    """Выбирает PEP`ы по значениям полей или считает их по группам.
+
+    Args:
+        db_path (Path): Путь к файлу базы данных.
+        where (list[tuple]): Пары (поле, значение), все должны совпасть.
+        group_by (str): Поле, по значениям которого считаются PEP`ы.
+
+    Raises:
+        PepDatabaseException: База ещё не заполнена режимом `pep`.
+
+    Returns:
+        results (list[tuple]): Найденные PEP`ы или количество по группам.
+    """
+    if not db_path.exists():
+        raise PepDatabaseException(
+            f'Нет базы метаданных PEP`ов {db_path}: запустите режим `pep`'
+        )
+    conditions = ' AND '.join([FILTER] * len(where)) or '1'
+    params = [item for pair in where for item in pair]
+    if group_by:
+        record = records.FieldCount
+        header = (group_by, 'Количество')
+        sql = (
+            'SELECT f.value, COUNT(*) FROM peps AS p '
+            'JOIN fields AS f ON f.number = p.number AND f.name = ? '
+            f'WHERE {conditions} '
+            'GROUP BY f.value ORDER BY COUNT(*) DESC, f.value'
+        )
+        params.insert(0, group_by)
+    else:
+        record = records.PepRow
+        header = record.HEADER
+        columns = ', '.join(column(name) for name in LIST_COLUMNS)
+        sql = (
+            f'SELECT p.number, p.title, {columns} FROM peps AS p '
+            f'WHERE {conditions} ORDER BY p.number'
+        )
+    start = time.perf_counter()
+    with closing(connect(db_path)) as conn:
+        rows = [record(*row) for row in conn.execute(sql, params)]
+    logging.info(
+        f'Запрос к базе PEP`ов выполнен за '
+        f'{(time.perf_counter() - start) * 1000:.1f} мс'
+    )
+    return [header, *rows]
@@ -0,0 +1,146 @@
+"""Прогресс длинных циклов парсера в виде событий для сменных приёмников.
+
+Событие содержит стадию, количество обработанных элементов, общее
+количество, скорость (элементов в секунду) и оценку оставшегося
+времени. События выдаются не чаще раза в интервал приёмника и в конце
+стадии. Приёмник выбирается аргументом `--progress`: полоса в
+терминале, файл JSONL или лог. Без приёмника (по умолчанию, если
+вывод не в терминал) `track` возвращает итерируемый объект как есть.
+"""
+import json
+import logging
+import sys
+import time
+
+import constants as const
+
+_config = {'sink': None, 'interval': const.PROGRESS_INTERVAL}
+
+
+def make_event(stage, done, total, elapsed, final=False):
+    """Событие прогресса стадии.
+
+    Args:
+        stage (str): Название стадии.
+        done (int): Обработано элементов.
+        total (int): Всего элементов, None если неизвестно.
+        elapsed (float): Секунд с начала стадии.
+        final (bool): Стадия завершена.
+
+    Returns:
+        dict: Событие, сериализуемое в JSON.
+    """
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate and total is not None else None
+    return {
+        'time': round(time.time(), 3),
+        'stage': stage,
+        'done': done,
+        'total': total,
+        'rate': round(rate, 1),
+        'eta': None if eta is None else round(eta, 1),
+        'elapsed': round(elapsed, 3),
+        'final': final,
+    }
+
+
+def describe(event):
+    """Строка события для терминала и лога.
+    """
+    total = '?' if event['total'] is None else event['total']
+    eta = '?' if event['eta'] is None else f'{event["eta"]:.0f} с'
+    return (
+        f'{event["stage"]}: {event["done"]}/{total}, '
+        f'{event["rate"]:.1f} шт/с, осталось {eta}'
+    )
+
+
+def bar_sink(event):
+    """Перерисовывает полосу прогресса в stderr.
+    """
+    width = const.PROGRESS_BAR_WIDTH
+    filled = width
+    if event['total']:
+        filled = width * event['done'] // event['total']
+    sys.stderr.write(
+        f'\r[{"#" * filled}{"." * (width - filled)}] {describe(event)}'
+        + ('\n' if event['final'] else '')
+    )
+    sys.stderr.flush()
+
+
+def log_sink(event):
+    """Записывает событие в лог.
+    """
+    logging.info(f'Прогресс {describe(event)}')
+
+
+def jsonl_sink(path):
+    """Приёмник, дописывающий события в файл JSONL.
+
+    Args:
+        path (Path): Путь к файлу событий.
+
+    Returns:
+        callable: Приёмник событий.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    def sink(event):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+    return sink
+
+
+def configure(kind, path=None):
+    """Выбирает приёмник событий прогресса.
+
+    Args:
+        kind (str): Приёмник из `const.PROGRESS_SINKS`; `auto` —
+            полоса, если stderr является терминалом, иначе прогресс
+            не отслеживается.
+        path (Path): Файл событий для приёмника `jsonl`.
+    """
+    if kind == 'auto':
+        kind = 'bar' if sys.stderr.isatty() else 'none'
+    _config['interval'] = const.PROGRESS_INTERVAL
+    if kind == 'bar':
+        _config['sink'] = bar_sink
+        _config['interval'] = const.PROGRESS_BAR_INTERVAL
+    elif kind == 'log':
+        _config['sink'] = log_sink
+    elif kind == 'jsonl':
+        _config['sink'] = jsonl_sink(path)
+    else:
+        _config['sink'] = None
+
+
+def track(iterable, total, stage):
+    """Отслеживает прогресс цикла по итерируемому объекту.
+
+    Args:
+        iterable (iterable): Элементы цикла.
+        total (int): Количество элементов, None если неизвестно.
+        stage (str): Название стадии в событиях.
+
+    Returns:
+        iterable: Те же элементы; без приёмника — сам `iterable`.
+    """
+    if _config['sink'] is None:
+        return iterable
+    return _tracked(iterable, total, stage, _config['sink'],
+                    _config['interval'])
+
+
+def _tracked(iterable, total, stage, sink, interval):
+    start = time.monotonic()
+    next_emit = start + interval
+    done = 0
+    for item in iterable:
+        yield item
+        done += 1
+        now = time.monotonic()
+        if now >= next_emit:
+            sink(make_event(stage, done, total, now - start))
+            next_emit = now + interval
+    sink(make_event(stage, done, total, time.monotonic() - start, True))
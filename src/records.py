@@ -0,0 +1,112 @@
+"""Типизированные записи результатов режимов парсера.
+
+Записи — `NamedTuple`: они не хранят `__dict__`, остаются кортежами
+для табличного и CSV-вывода и задают типы столбцов для колоночного
+вывода `parquet`/`arrow`. Заголовок таблицы (`HEADER`) по-прежнему
+идёт первым элементом результатов.
+"""
+from typing import NamedTuple, Optional
+
+
+class WhatsNewArticle(NamedTuple):
+    link: str
+    title: str
+    editors: str
+
+    HEADER = ('Ссылка на статью', 'Заголовок', 'Редактор, Aвтор')
+
+
+class VersionLink(NamedTuple):
+    link: str
+    version: str
+    status: str
+
+    HEADER = ('Ссылка на документацию', 'Версия', 'Статус')
+
+
+class VersionFacts(NamedTuple):
+    version: str
+    status: str
+    release: str
+    whats_new: str
+    archives: str
+
+    HEADER = ('Версия', 'Статус', 'Выпуск', "What's New", 'Архивы')
+
+
+class StatusCount(NamedTuple):
+    status: str
+    count: int
+
+    HEADER = ('Статус', 'Количество')
+
+
+class PepRow(NamedTuple):
+    number: int
+    title: str
+    type: Optional[str]
+    status: Optional[str]
+    python_version: Optional[str]
+
+    HEADER = ('PEP', 'Заголовок', 'Type', 'Status', 'Python-Version')
+
+
+class FieldCount(NamedTuple):
+    value: str
+    count: int
+
+    HEADER = ('Значение', 'Количество')
+
+
+class LinkStatus(NamedTuple):
+    url: str
+    status: int
+    target: str
+    latency_ms: float
+    error: str
+    article: str
+
+    HEADER = (
+        'Ссылка', 'Код', 'Перенаправление', 'Задержка, мс', 'Ошибка',
+        'Статья'
+    )
+
+
+class HistoryRun(NamedTuple):
+    run_id: int
+    started_at: str
+    rows: int
+
+    HEADER = ('Прогон', 'Время запуска', 'Строк')
+
+
+class Change(NamedTuple):
+    change: str
+    key: str
+    old: str
+    new: str
+
+    HEADER = ('Изменение', 'Ключ', 'Было', 'Стало')
+
+
+class PrefetchSummary(NamedTuple):
+    mode: str
+    urls: int
+    loaded: int
+    failed: int
+
+    HEADER = ('Режим', 'Адресов', 'Загружено', 'Ошибок')
+
+
+SCHEMAS = {
+    'whats-new': WhatsNewArticle,
+    'latest-versions': VersionLink,
+    'version-matrix': VersionFacts,
+    'pep': StatusCount,
+    'merge': StatusCount,
+    'pep-query': PepRow,
+    'link-check': LinkStatus,
+    'history': HistoryRun,
+    'diff': Change,
+    'cache-prefetch': PrefetchSummary,
+}
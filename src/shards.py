@@ -0,0 +1,125 @@
+"""Разбиение режима `pep` на шарды и объединение их результатов.
+"""
+import json
+import logging
+import zlib
+
+from exceptions import ShardException
+
+SHARD_FILE_PATTERN = 'pep_*-of-*.json'
+
+
+def shard_file_name(shard, shards):
+    """Имя файла с результатами шарда.
+
+    Args:
+        shard (int): Номер шарда, начиная с 1.
+        shards (int): Общее количество шардов.
+
+    Returns:
+        str: Имя файла.
+    """
+    return f'pep_{shard}-of-{shards}.json'
+
+
+def in_shard(key, shard, shards):
+    """Определяет, относится ли строка индекса к шарду.
+
+    Разбиение зависит только от ключа строки (ссылки на PEP),
+    поэтому на любом хосте оно получается одинаковым.
+
+    Args:
+        key (str): Ключ строки индекса.
+        shard (int): Номер шарда, начиная с 1.
+        shards (int): Общее количество шардов.
+
+    Returns:
+        bool: True, если строка обрабатывается этим шардом.
+    """
+    return zlib.crc32(key.encode('utf-8')) % shards == shard - 1
+
+
+def write_shard(shard_dir, shard, shards, total_by_status, mismatches):
+    """Сохраняет частичные результаты шарда в файл .json .
+
+    Args:
+        shard_dir (Path): Директория для файлов шардов.
+        shard (int): Номер шарда, начиная с 1.
+        shards (int): Общее количество шардов.
+        total_by_status (dict): Количество PEP`ов по статусам.
+        mismatches (list[dict]): Несовпадающие статусы.
+
+    Returns:
+        Path: Путь к сохранённому файлу.
+    """
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    file_path = shard_dir / shard_file_name(shard, shards)
+    data = {
+        'mode': 'pep',
+        'shard': shard,
+        'shards': shards,
+        'total_by_status': dict(total_by_status),
+        'mismatches': mismatches,
+    }
+    tmp_path = file_path.with_suffix('.tmp')
+    with open(file=tmp_path, mode='w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(file_path)
+
+    logging.info(f'Результаты шарда {shard}/{shards} сохранены: {file_path}')
+    return file_path
+
+
+def read_shards(shard_dir):
+    """Читает файлы шардов и проверяет, что набор полный.
+
+    Args:
+        shard_dir (Path): Директория с файлами шардов.
+
+    Raises:
+        ShardException: Нет файлов, разное число шардов или пропуски.
+
+    Returns:
+        list[dict]: Данные шардов, упорядоченные по номеру.
+    """
+    files = sorted(shard_dir.glob(SHARD_FILE_PATTERN))
+    if not files:
+        raise ShardException(f'Не найдены файлы шардов в {shard_dir}')
+
+    data = []
+    for file_path in files:
+        with open(file=file_path, encoding='utf-8') as f:
+            data.append(json.load(f))
+
+    shards = {item['shards'] for item in data}
+    if len(shards) != 1:
+        raise ShardException(
+            f'Файлы шардов относятся к разным разбиениям: {sorted(shards)}'
+        )
+    shards = shards.pop()
+    found = {item['shard'] for item in data}
+    missing = set(range(1, shards + 1)) - found
+    if missing:
+        raise ShardException(
+            f'Отсутствуют шарды {sorted(missing)} из {shards}'
+        )
+    return sorted(data, key=lambda item: item['shard'])
+
+
+def merge_shards(shard_dir):
+    """Объединяет результаты всех шардов.
+
+    Args:
+        shard_dir (Path): Директория с файлами шардов.
+
+    Returns:
+        tuple(dict, list): Количество PEP`ов по статусам,
+            несовпадающие статусы.
+    """
+    total_by_status = {}
+    mismatches = []
+    for item in read_shards(shard_dir):
+        for status, count in item['total_by_status'].items():
+            total_by_status[status] = total_by_status.get(status, 0) + count
+        mismatches.extend(item['mismatches'])
+    return total_by_status, mismatches
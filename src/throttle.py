@@ -0,0 +1,222 @@
+"""Адаптивное ограничение одновременных запросов к каждому хосту (AIMD).
+
+Лимит растёт на 1 примерно за каждое окно быстрых ответов
+(аддитивное увеличение) и умножается на `const.DECREASE_FACTOR` при
+ответах 429/503, ошибках соединения и медленных ответах
+(мультипликативное уменьшение). `Retry-After` приостанавливает
+запросы к хосту на указанное время.
+"""
+import datetime as dt
+import email.utils
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import constants as const
+
+THROTTLE_STATUSES = (429, 503)
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+class HostLimiter:
+    """Лимит одновременных запросов к одному хосту.
+    """
+
+    def __init__(self, host, initial=const.HOST_CONCURRENCY,
+                 maximum=const.MAX_HOST_CONCURRENCY):
+        self.host = host
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.started = False
+        self.throttled = 0
+        self.retries = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Ждёт свободного места в лимите и окончания `Retry-After`.
+        """
+        with self._cond:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+
+    def start_at(self, initial):
+        """Задаёт начальный лимит при первой параллельной загрузке.
+
+        Лимит, уже сниженный ответами хоста или заданный раньше,
+        не меняется: дальше его подстраивает только AIMD.
+
+        Args:
+            initial (int): Начальный лимит, не больше максимального.
+        """
+        with self._cond:
+            if self.started or self.last_decrease:
+                return
+            self.started = True
+            self.limit = float(max(1, min(initial, self.maximum)))
+            self._cond.notify_all()
+
+    def release(self, latency=None, status=None, retry_after=None,
+                error=False):
+        """Освобождает место и корректирует лимит по результату запроса.
+
+        Args:
+            latency (float): Время ответа в секундах. None для ответов
+                из кеша — они лимит не меняют.
+            status (int): Код ответа сервера.
+            retry_after (float): Пауза из заголовка `Retry-After`, секунд.
+            error (bool): Запрос завершился ошибкой соединения.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES or error:
+                self.throttled += status in THROTTLE_STATUSES
+                if retry_after:
+                    self.blocked_until = max(
+                        self.blocked_until, now + retry_after
+                    )
+                self._decrease(now, latency or 0)
+            elif latency is not None:
+                if latency > const.LATENCY_THRESHOLD:
+                    self._decrease(now, latency)
+                else:
+                    self.limit = min(
+                        self.maximum, self.limit + 1 / self.limit
+                    )
+            self._cond.notify_all()
+
+    def _decrease(self, now, latency):
+        # Ответы, отправленные до предыдущего уменьшения, ещё отражают
+        # старый лимит, поэтому уменьшаем не чаще раза за время ответа.
+        if now - self.last_decrease < latency:
+            return
+        self.last_decrease = now
+        old_limit = self.limit
+        self.limit = max(1.0, self.limit * const.DECREASE_FACTOR)
+        logging.info(
+            f'Лимит одновременных запросов к {self.host}: '
+            f'{old_limit:.1f} -> {self.limit:.1f}'
+        )
+
+
+def limiter_for(url):
+    """Возвращает лимит для хоста адреса, создавая его при необходимости.
+
+    Args:
+        url (str): Адрес web-страницы.
+
+    Returns:
+        HostLimiter: Лимит хоста.
+    """
+    host = urlsplit(url).netloc
+    with _lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter(host)
+        return _limiters[host]
+
+
+def parse_retry_after(value):
+    """Разбирает заголовок `Retry-After`.
+
+    Args:
+        value (str): Число секунд или HTTP-дата.
+
+    Returns:
+        float: Пауза в секундах, не больше `const.MAX_RETRY_AFTER`.
+        None: Заголовок отсутствует или некорректен.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = (date - dt.datetime.now(dt.timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), const.MAX_RETRY_AFTER)
+
+
+def send(session, url, get=None):
+    """Выполняет GET-запрос в пределах лимита хоста с повторами на 429/503.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        get (callable): Функция запроса. По умолчанию `session.get`.
+
+    Raises:
+        RequestException: Ошибка соединения.
+
+    Returns:
+        response(request.Response): Ответ сервера.
+    """
+    get = get or session.get
+    limiter = limiter_for(url)
+    for attempt in range(const.MAX_RETRIES + 1):
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = get(url)
+        except Exception:
+            limiter.release(error=True)
+            raise
+        if getattr(response, 'from_cache', False):
+            limiter.release()
+            return response
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is None:
+            retry_after = const.RETRY_BACKOFF * 2 ** attempt
+        limiter.release(
+            latency=time.monotonic() - start,
+            status=response.status_code,
+            retry_after=retry_after
+        )
+        if (
+            response.status_code not in THROTTLE_STATUSES
+            or attempt == const.MAX_RETRIES
+        ):
+            return response
+        response.close()
+        limiter.retries += 1
+        logging.warning(
+            f'Сервер ответил {response.status_code} на {url}, '
+            f'повтор {attempt + 1} из {const.MAX_RETRIES}'
+        )
+    return response
+
+
+def reset():
+    """Сбрасывает накопленные лимиты всех хостов.
+    """
+    with _lock:
+        _limiters.clear()
+
+
+def snapshot():
+    """Текущее состояние лимитов по хостам.
+
+    Returns:
+        list[tuple]: Хост, лимит, запросов в работе, ответов 429/503,
+            повторов.
+    """
+    with _lock:
+        limiters = list(_limiters.values())
+    return [
+        (
+            limiter.host, round(limiter.limit, 1), limiter.in_flight,
+            limiter.throttled, limiter.retries
+        )
+        for limiter in limiters
+    ]
@@ -1,18 +1,32 @@
+import hashlib
+import json
 import logging
+import re
+import sys
+from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 from requests import RequestException
 
 import constants as const
+import fetch
+import records
 from exceptions import ParserFindTagException, TableException
 
+ARCHIVE_PATTERN = re.compile(r'docs(?:-(?P<format>[\w-]+)\.zip|\.epub)$')
 
-def get_response(session, url):
+
+def get_response(session, url, allow_partial=False):
     """Перехват ошибки RequestException.
 
+    Запрос проходит через `fetch.get`: адрес нормализуется, а
+    одновременные запросы одного адреса объединяются в одну загрузку.
+
     Args:
         session (request.Session): Объект сессии.
         url (str): Адрес web-страницы.
+        allow_partial (bool): Принять из кеша начало страницы.
 
     Returns:
         response(request.Response): Ответ сервера с запрошенного адреса.
@@ -20,9 +34,7 @@ def get_response(session, url):
 
     """
     try:
-        response = session.get(url)
-        response.encoding = 'utf-8'
-        return response
+        return fetch.get(session, url, allow_partial)
     except RequestException:
         logging.exception(
             f'Возникла ошибка при загрузке страницы {url}',
@@ -30,12 +42,14 @@ def get_response(session, url):
         )
 
 
-def make_soup(url, session):
+def make_soup(url, session, parse_only=None):
     """Получение объекта BeautifulSoup.
 
     Args:
         url (str): Адрес web-сраницы.
         session (request.Session): Объект сессии.
+        parse_only (bs4.SoupStrainer): Строить дерево только для
+            подходящих тегов.
 
     Returns:
         bs4.BeautifulSoup: Текст запрошенной страницы.
@@ -44,7 +58,125 @@ def make_soup(url, session):
     responce = get_response(session, url)
     if responce is None:
         return None
-    return BeautifulSoup(responce.text, 'lxml')
+    return soup_from_response(responce, parse_only)
+
+
+def make_head_soup(url, session, tags):
+    """Получение объекта BeautifulSoup по началу страницы.
+
+    Страница читается потоком через инкрементальный парсер lxml;
+    как только все теги `tags` закрыты, чтение прекращается и
+    соединение закрывается. Прочитанное начало сохраняется в кеш
+    с пометкой о неполноте. Если страница уже есть в кеше,
+    используется она.
+
+    Args:
+        url (str): Адрес web-сраницы.
+        session (request.Session): Объект сессии.
+        tags (tuple[str]): Теги, которые нужно получить целиком.
+
+    Returns:
+        bs4.BeautifulSoup: Начало запрошенной страницы.
+        None: При ошибке загрузки страницы.
+    """
+    url = fetch.normalize_url(url)
+    if fetch.is_cached(session, url):
+        response = get_response(session, url, allow_partial=True)
+        if response is None:
+            return None
+        return soup_from_response(response)
+    try:
+        response = fetch.open_stream(session, url)
+    except RequestException:
+        logging.exception(
+            f'Возникла ошибка при загрузке страницы {url}',
+            stack_info=True
+        )
+        return None
+    body, complete = read_until_tags(response, tags)
+    fetch.save_to_cache(session, response, complete, body)
+    return soup_from_response(response)
+
+
+def read_until_tags(response, tags):
+    """Читает тело ответа, пока в нём не закроются все теги `tags`.
+
+    Args:
+        response(request.Response): Ответ с непрочитанным телом.
+        tags (tuple[str]): Теги, которые нужно получить целиком.
+
+    Returns:
+        tuple(bytes, bool): Прочитанное тело, признак полного чтения.
+    """
+    parser = etree.HTMLPullParser(
+        events=('end',), tag=tags, encoding=get_charset(response)
+    )
+    remaining = set(tags)
+    chunks = []
+    complete = True
+    for chunk in response.iter_content(const.STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        parser.feed(chunk)
+        remaining.difference_update(
+            element.tag for _, element in parser.read_events()
+        )
+        if not remaining:
+            complete = False
+            break
+    response.close()
+    return b''.join(chunks), complete
+
+
+def get_charset(response):
+    """Кодировка страницы из заголовка `Content-Type`.
+
+    Args:
+        response(request.Response): Ответ сервера.
+
+    Returns:
+        str: Объявленная кодировка или `const.DEFAULT_ENCODING`.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    match = re.search(r'charset=["\']?([\w.:-]+)', content_type, re.I)
+    if match is None:
+        return const.DEFAULT_ENCODING
+    return match.group(1)
+
+
+def soup_from_response(response, parse_only=None):
+    """Разбирает тело ответа без промежуточного декодирования в str.
+
+    Байты ответа (из сети или кеша) передаются lxml вместе с
+    объявленной кодировкой, поэтому копия страницы в виде str
+    не создаётся.
+
+    Args:
+        response(request.Response): Ответ сервера.
+        parse_only (bs4.SoupStrainer): Строить дерево только для
+            подходящих тегов.
+
+    Returns:
+        bs4.BeautifulSoup: Текст запрошенной страницы.
+    """
+    return BeautifulSoup(
+        response.content, 'lxml', from_encoding=get_charset(response),
+        parse_only=parse_only
+    )
+
+
+def decompose(soup):
+    """Разрушает дерево страницы, освобождая память сразу.
+
+    Дерево BeautifulSoup связано циклическими ссылками и без этого
+    живёт до прохода сборщика мусора. `BeautifulSoup.decompose()`
+    не обходит потомков корня, поэтому разрушаются сами потомки.
+
+    Args:
+        soup (bs4.BeautifulSoup): Разобранная страница.
+    """
+    for child in list(soup.contents):
+        child.decompose()
+    soup.decompose()
 
 
 def find_tag(soup, tag, attrs=None):
@@ -70,40 +202,131 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
+def parse_versions(soup):
+    """Разбирает список версий Python в боковой панели документации.
+
+    Args:
+        soup (bs4.BeautifulSoup): Главная страница документации.
+
+    Raises:
+        Exception: Некорректные настройки парсера для поиска.
+
+    Returns:
+        list[records.VersionLink]: Ссылка на документацию, версия, статус.
+    """
+    sidebar = find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
+    ul_tags = sidebar.find_all('ul')
+    for ul in ul_tags:
+        if 'All versions' in ul.text:
+            a_tags = ul.find_all('a')
+            break
+    else:
+        raise Exception('Ничего не нашлось')
+
+    versions = []
+    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+    for a_tag in a_tags:
+        link = a_tag['href']
+        text_match = re.search(pattern, a_tag.text)
+        if text_match is not None:
+            version, status = text_match.groups()
+        else:
+            version, status = a_tag.text, ''
+        versions.append(records.VersionLink(link, version, status))
+    return versions
+
+
+def view_whats_new_page(url, session):
+    """Извлекает заголовок и редакторов статьи о нововведениях.
+
+    Загружается только начало статьи — до первых `<h1>` и `<dl>`.
+
+    Args:
+        url (str): Адрес web-страницы.
+        session (request.Session): Объект сессии.
+
+    Returns:
+        tuple(str, str): Заголовок статьи, редакторы и авторы.
+        None: При ошибке загрузки страницы.
+    """
+    soup = make_head_soup(url, session, ('h1', 'dl'))
+    if soup is None:
+        return None
+    h1 = find_tag(soup, 'h1')
+    h1_text = h1.text
+    dl = find_tag(soup, 'dl')
+    dl_text = dl.text.replace('\n', ' ')
+    decompose(soup)
+    return h1_text, dl_text
+
+
+def page_links(url, session):
+    """Собирает адреса всех ссылок http(s) на странице.
+
+    Адреса нормализуются (в том числе без фрагмента `#...`), повторы
+    отбрасываются.
+
+    Args:
+        url (str): Адрес web-страницы.
+        session (request.Session): Объект сессии.
+
+    Returns:
+        list[str]: Адреса ссылок в порядке появления на странице.
+        None: При ошибке загрузки страницы.
+    """
+    soup = make_soup(url, session, SoupStrainer('a', href=True))
+    if soup is None:
+        return None
+    links = {}
+    for a_tag in soup.find_all('a', href=True):
+        link = urljoin(url, a_tag['href'])
+        if link.startswith(('http://', 'https://')):
+            links.setdefault(fetch.normalize_url(link))
+    decompose(soup)
+    return list(links)
+
+
 def view_pep_page(url, session):
-    """Проверяет статус и тип на странице PEP`а.
+    """Извлекает заголовок и все поля шапки со страницы PEP`а.
 
     Args:
         url (str): Адрес web-страницы.
         session (request.Session): Объект сессии.
 
     Returns:
-        tuple(str, str): Тип PEP`а, статус PEP`а.
+        dict: {поле шапки: значение}, заголовок — в поле `Title`.
+        None: При ошибке загрузки страницы.
     """
-    tipe = status = ''
     soup = make_soup(url, session)
     if soup is None:
         return None
-    pep_info = find_tag(soup, 'dl')
-    dt_tags = pep_info.find_all('dt')
-    dd_tags = pep_info.find_all('dd')
-    dt_dd_tags = tuple(zip(dt_tags, dd_tags))
-    for tags in dt_dd_tags:
-        if tipe != '' and status != '':
-            break
-        if tags[0].text == 'Type':
-            if tipe != '':
-                logging.warning(
-                    f'Повтор текста `Type` на странице {url}'
-                )
-            tipe = tags[1].text
-        elif tags[0].text == 'Status':
-            if status != '':
-                logging.warning(
-                    f'Повтор текста `Status` на странице {url}'
-                )
-            status = tags[1].text
-    return tipe, status
+    fields = parse_pep_header(find_tag(soup, 'dl'), url)
+    h1 = soup.find('h1')
+    if h1 is not None:
+        fields.setdefault('Title', h1.text.strip('¶ \n'))
+    decompose(soup)
+    return fields
+
+
+def parse_pep_header(pep_info, url):
+    """Разбирает шапку PEP`а — пары `<dt>`/`<dd>`.
+
+    Args:
+        pep_info (bs4.element.Tag): Тег `<dl>` шапки.
+        url (str): Адрес страницы PEP`а.
+
+    Returns:
+        dict: {поле шапки: значение}.
+    """
+    fields = {}
+    dt_dd_tags = zip(pep_info.find_all('dt'), pep_info.find_all('dd'))
+    for dt_tag, dd_tag in dt_dd_tags:
+        name = dt_tag.text.strip().rstrip(':')
+        if name in fields:
+            logging.warning(f'Повтор текста `{name}` на странице {url}')
+            continue
+        fields[sys.intern(name)] = sys.intern(' '.join(dd_tag.text.split()))
+    return fields
 
 
 def check_status(page_status, type_status_in_table, page_url):
@@ -116,12 +339,137 @@ def check_status(page_status, type_status_in_table, page_url):
 
     Raises:
         TableException: Некорректное содержание статуса в таблице.
+
+    Returns:
+        bool: True, если статусы совпадают.
     """
     if len(type_status_in_table) <= 2:
         table_status = type_status_in_table[1:]
         if page_status not in const.EXPECTED_STATUS[table_status]:
             logging.info(f'Несовпадающие статусы:\n{page_url}')
+            return False
+        return True
     else:
         raise TableException(
             f'Неожиданное содержание статуса {type_status_in_table}'
             )
+
+
+def parse_release(soup):
+    """Номер выпуска из заголовка корневой страницы документации.
+
+    Args:
+        soup (bs4.BeautifulSoup): Корневая страница документации версии.
+
+    Returns:
+        str: Номер выпуска, например `3.12.4`, или пустая строка.
+    """
+    title = soup.find('title')
+    if title is None:
+        return ''
+    match = re.search(r'(\d+\.\d+[\w.+]*) Documentation', title.text)
+    return match.group(1) if match is not None else ''
+
+
+def parse_archives(soup, url):
+    """Разбирает таблицу архивов на странице загрузки документации.
+
+    Args:
+        soup (bs4.BeautifulSoup): Страница загрузки.
+        url (str): Адрес страницы загрузки.
+
+    Returns:
+        list[tuple]: Формат архива, адрес архива, размер.
+    """
+    table = soup.find('table')
+    if table is None:
+        return []
+    archives = []
+    for a_tag in table.find_all('a', href=ARCHIVE_PATTERN):
+        archive_format = ARCHIVE_PATTERN.search(a_tag['href'])['format']
+        size = re.search(r'\(ca\. ([^)]+)\)', a_tag.parent.text)
+        archives.append((
+            archive_format or 'epub',
+            urljoin(url, a_tag['href']),
+            size.group(1) if size is not None else '',
+        ))
+    return archives
+
+
+def view_version_page(kind, url, session):
+    """Извлекает сведения об одной версии Python с одной её страницы.
+
+    Корневая страница и «What's New» читаются только до нужного тега.
+
+    Args:
+        kind (str): Вид страницы: `root`, `whats-new` или `download`.
+        url (str): Адрес web-страницы.
+        session (request.Session): Объект сессии.
+
+    Returns:
+        str: Номер выпуска или заголовок «What's New».
+        list[tuple]: Архивы со страницы загрузки.
+        None: При ошибке загрузки страницы.
+    """
+    if kind == 'download':
+        soup = make_soup(url, session)
+    else:
+        soup = make_head_soup(
+            url, session, ('title' if kind == 'root' else 'h1',)
+        )
+    if soup is None:
+        return None
+    if kind == 'download':
+        found = parse_archives(soup, url)
+    elif kind == 'root':
+        found = parse_release(soup)
+    else:
+        h1 = soup.find('h1')
+        found = h1.text.strip('¶ \n') if h1 is not None else ''
+    decompose(soup)
+    return found
+
+
+def file_sha256(path):
+    """Контрольная сумма файла.
+
+    Args:
+        path (Path): Путь к файлу.
+
+    Returns:
+        str: Шестнадцатеричный SHA-256.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_json(path):
+    """Читает словарь из JSON-файла.
+
+    Args:
+        path (Path): Путь к файлу.
+
+    Returns:
+        dict: Содержимое файла или пустой словарь, если файла нет.
+    """
+    if not path.exists():
+        return {}
+    with open(file=path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    """Атомарно сохраняет словарь в JSON-файл.
+
+    Args:
+        path (Path): Путь к файлу.
+        data (dict): Сохраняемые данные.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(file=tmp_path, mode='w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    tmp_path.replace(path)
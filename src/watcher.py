@@ -0,0 +1,167 @@
+"""Дешёвое отслеживание изменений в списке версий Python.
+"""
+import datetime as dt
+import hashlib
+import json
+import logging
+import time
+
+from requests import RequestException
+
+import fetch
+import utils
+
+
+def conditional_get(session, url, state):
+    """Выполняет условный запрос в обход кеша.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        state (dict): Состояние с `etag` и `last_modified`.
+
+    Returns:
+        response(request.Response): Ответ сервера.
+        None: При ошибке загрузки страницы.
+    """
+    try:
+        return fetch.send_uncached(
+            session, url, headers=fetch.conditional_headers(state)
+        )
+    except RequestException:
+        logging.exception(
+            f'Возникла ошибка при загрузке страницы {url}',
+            stack_info=True
+        )
+
+
+def compare_versions(old, new):
+    """Находит изменения в списке версий.
+
+    Args:
+        old (dict): Прежние версии: {версия: [ссылка, статус]}.
+        new (dict): Текущие версии: {версия: [ссылка, статус]}.
+
+    Returns:
+        list[dict]: События изменений.
+    """
+    events = []
+    for version, (link, status) in new.items():
+        if version not in old:
+            events.append({
+                'event': 'new_version',
+                'version': version,
+                'status': status,
+                'link': link,
+            })
+        elif old[version][1] != status:
+            events.append({
+                'event': 'status_changed',
+                'version': version,
+                'old_status': old[version][1],
+                'status': status,
+                'link': link,
+            })
+    for version, (link, status) in old.items():
+        if version not in new:
+            events.append({
+                'event': 'version_removed',
+                'version': version,
+                'old_status': status,
+                'link': link,
+            })
+    return events
+
+
+def poll(session, url, state):
+    """Один опрос страницы со списком версий.
+
+    Разбор страницы пропускается, если сервер ответил 304
+    или тело ответа не изменилось.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        state (dict): Состояние наблюдателя, обновляется на месте.
+
+    Returns:
+        list[dict]: События изменений.
+    """
+    response = conditional_get(session, url, state)
+    if response is None or response.status_code == 304:
+        return []
+    if not response.ok:
+        logging.warning(
+            f'Страница {url} вернула статус {response.status_code}'
+        )
+        return []
+
+    state['etag'] = response.headers.get('ETag')
+    state['last_modified'] = response.headers.get('Last-Modified')
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    if body_hash == state.get('hash'):
+        return []
+
+    soup = utils.soup_from_response(response)
+    versions = {
+        version: [link, status]
+        for link, version, status in utils.parse_versions(soup)
+    }
+    utils.decompose(soup)
+    events = []
+    if 'versions' in state:
+        events = compare_versions(state['versions'], versions)
+    else:
+        logging.info(f'Начальный список версий: {len(versions)}')
+    state['hash'] = body_hash
+    state['versions'] = versions
+    return events
+
+
+def emit(events, events_file=None):
+    """Выводит события в stdout или дописывает их в файл JSONL.
+
+    Args:
+        events (list[dict]): События изменений.
+        events_file (Path): Файл событий. По умолчанию stdout.
+    """
+    if not events:
+        return
+    now = dt.datetime.now().isoformat(timespec='seconds')
+    lines = [
+        json.dumps({'time': now, **event}, ensure_ascii=False)
+        for event in events
+    ]
+    if events_file is None:
+        print(*lines, sep='\n', flush=True)
+        return
+    with open(file=events_file, mode='a', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def watch(session, url, state_path, interval, iterations=0,
+          events_file=None):
+    """Опрашивает страницу с интервалом и выводит события изменений.
+
+    Args:
+        session (request.Session): Объект сессии.
+        url (str): Адрес web-страницы.
+        state_path (Path): Путь к файлу состояния.
+        interval (float): Интервал между опросами в секундах.
+        iterations (int): Количество опросов, 0 — без ограничения.
+        events_file (Path): Файл событий. По умолчанию stdout.
+    """
+    state = utils.load_json(state_path)
+    poll_number = 0
+    try:
+        while True:
+            poll_number += 1
+            events = poll(session, url, state)
+            utils.save_json(state_path, state)
+            emit(events, events_file)
+            if iterations and poll_number >= iterations:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        logging.info('Наблюдение прервано')
+    logging.info(f'Наблюдение завершено после {poll_number} опросов')
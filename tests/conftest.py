@@ -110,3 +110,120 @@ def records():
         result = results[mode]
         return converting(result)
     return _records
+
+
+PEP_DOC_URL = 'https://peps.python.org/'
+PEP_STATUSES = (
+    ('SF', 'Standards Track', 'Final'),
+    ('IA', 'Informational', 'Active'),
+    ('SD', 'Standards Track', 'Draft'),
+    ('PR', 'Process', 'Rejected'),
+    ('SW', 'Standards Track', 'Withdrawn'),
+)
+
+
+def pep_index_html(count: int) -> str:
+    rows = []
+    for number in range(1, count + 1):
+        abbr = PEP_STATUSES[number % len(PEP_STATUSES)][0]
+        rows.append(
+            f'<tr><td><abbr>{abbr}</abbr></td>'
+            f'<td><a href="pep-{number:04d}/">{number}</a></td>'
+            f'<td>PEP {number}</td></tr>'
+        )
+    return (
+        '<html><body><section id="numerical-index"><table><tbody>'
+        + ''.join(rows)
+        + '</tbody></table></section></body></html>'
+    )
+
+
+def pep_page_html(number: int) -> str:
+    _, tipe, status = PEP_STATUSES[number % len(PEP_STATUSES)]
+    return (
+        f'<html><body><h1>PEP {number} – Title {number}</h1><dl>'
+        f'<dt>PEP</dt><dd>{number}</dd>'
+        f'<dt>Author</dt><dd>Author {number}</dd>'
+        f'<dt>Status</dt><dd>{status}</dd>'
+        f'<dt>Type</dt><dd>{tipe}</dd>'
+        f'<dt>Created</dt><dd>01-Jan-2000</dd>'
+        f'<dt>Python-Version</dt><dd>3.{number % 4}</dd>'
+        '</dl><p>' + 'Text. ' * 50 + '</p></body></html>'
+    )
+
+
+@pytest.fixture
+def pep_site():
+    """Синтетический индекс PEP с `count` страницами."""
+    def _pep_site(mock, count=20):
+        mock.get(PEP_DOC_URL, text=pep_index_html(count))
+        for number in range(1, count + 1):
+            mock.get(
+                f'{PEP_DOC_URL}pep-{number:04d}/',
+                text=pep_page_html(number)
+            )
+        return count
+    return _pep_site
+
+
+DOCS_URL = 'https://docs.python.org/'
+DOCS_VERSIONS = (
+    ('3.13', 'in development', '3.13.0a1'),
+    ('3.12', 'stable', '3.12.4'),
+    ('3.11', 'security-fixes', '3.11.9'),
+)
+DOCS_FORMATS = ('pdf-a4', 'pdf-letter', 'html', 'text')
+
+
+def docs_main_html() -> str:
+    links = ''.join(
+        f'<li><a href="{DOCS_URL}{version}/">'
+        f'Python {version} ({status})</a></li>'
+        for version, status, _ in DOCS_VERSIONS
+    )
+    return (
+        '<html><body><div class="sphinxsidebarwrapper">'
+        f'<ul><li>All versions</li>{links}</ul>'
+        '</div></body></html>'
+    )
+
+
+def docs_download_html(version: str) -> str:
+    rows = ''.join(
+        f'<tr><td>{archive_format}</td><td><a href="archives/python-'
+        f'{version}-docs-{archive_format}.zip">Download</a> '
+        f'(ca. {size} MiB)</td></tr>'
+        for size, archive_format in enumerate(DOCS_FORMATS, start=10)
+    )
+    return (
+        '<html><body><table>'
+        f'{rows}<tr><td>EPUB</td><td><a href="archives/python-{version}'
+        '-docs.epub">Download</a> (ca. 5 MiB)</td></tr>'
+        '</table></body></html>'
+    )
+
+
+def docs_site_pages() -> dict:
+    pages = {f'{DOCS_URL}3/': docs_main_html()}
+    for version, _, release in DOCS_VERSIONS:
+        pages[f'{DOCS_URL}{version}/'] = (
+            f'<html><head><title>{release} Documentation</title></head>'
+            '<body></body></html>'
+        )
+        pages[f'{DOCS_URL}{version}/whatsnew/{version}.html'] = (
+            f'<html><body><h1>What’s New In Python {version}¶</h1>'
+            '</body></html>'
+        )
+        pages[f'{DOCS_URL}{version}/download.html'] = (
+            docs_download_html(version)
+        )
+    return pages
+
+
+@pytest.fixture
+def docs_site():
+    """Синтетический сайт документации с версиями `DOCS_VERSIONS`."""
+    def _docs_site(mock):
+        for url, text in docs_site_pages().items():
+            mock.get(url, text=text)
+    return _docs_site
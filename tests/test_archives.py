@@ -0,0 +1,114 @@
+import io
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import requests_mock
+from conftest import MAIN_DOC_URL, docs_download_html
+try:
+    from src import archives, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archives.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archives.py`'
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-3-docs-pdf-a4.zip'
+CONTENT = b'PK' + b'\0' * 1000
+
+
+def archive_callback(etag):
+    def _callback(request, context):
+        if request.headers.get('If-None-Match') == etag:
+            context.status_code = 304
+            return b''
+        context.headers['ETag'] = etag
+        return CONTENT
+    return _callback
+
+
+def test_download_archive_skips_unchanged(tmp_path, tempfile_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=archive_callback('"v1"'))
+        outcome, entry = archives.download_archive(
+            tempfile_session, ARCHIVE_URL, tmp_path
+        )
+        assert outcome == archives.DOWNLOADED
+        assert entry['etag'] == '"v1"'
+        assert entry['size'] == len(CONTENT)
+        path = tmp_path / 'python-3-docs-pdf-a4.zip'
+        assert path.read_bytes() == CONTENT
+
+        assert archives.download_archive(
+            tempfile_session, ARCHIVE_URL, tmp_path, entry
+        ) == (archives.UNCHANGED, entry)
+        assert mock.last_request.headers['If-None-Match'] == '"v1"'
+
+        path.write_bytes(b'broken')
+        outcome, _ = archives.download_archive(
+            tempfile_session, ARCHIVE_URL, tmp_path, entry
+        )
+        assert outcome == archives.DOWNLOADED
+        assert 'If-None-Match' not in mock.last_request.headers
+        assert path.read_bytes() == CONTENT
+    assert not list(tmp_path.glob('*.part'))
+
+
+class BrokenStream(io.BytesIO):
+    """Тело ответа, соединение которого обрывается после начала."""
+
+    def read(self, *args, **kwargs):
+        if self.tell():
+            raise ConnectionResetError('Соединение сброшено')
+        return super().read(*args, **kwargs)
+
+
+def test_download_archive_stream_error(tmp_path, tempfile_session):
+    path = tmp_path / 'python-3-docs-pdf-a4.zip'
+    path.write_bytes(b'old')
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, body=BrokenStream(CONTENT))
+        assert archives.download_archive(
+            tempfile_session, ARCHIVE_URL, tmp_path
+        ) == (archives.FAILED, None)
+    assert path.read_bytes() == b'old', (
+        'Прерванная загрузка не должна заменять прежний архив'
+    )
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_download_formats_with_manifest(monkeypatch, tmp_path,
+                                        tempfile_session):
+    monkeypatch.setattr(main, 'BASE_DIR', Path(tmp_path))
+    cli_args = Namespace(formats=['pdf-a4', 'epub', 'html'], workers=3)
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL + 'download.html', text=docs_download_html('3'))
+        for name in ('pdf-a4.zip', 'html.zip', 'text.zip'):
+            mock.get(
+                f'{MAIN_DOC_URL}archives/python-3-docs-{name}',
+                content=archive_callback(f'"{name}"')
+            )
+        mock.get(
+            MAIN_DOC_URL + 'archives/python-3-docs.epub',
+            content=archive_callback('"epub"')
+        )
+        assert main.download(tempfile_session, cli_args) is None
+        downloads_dir = tmp_path / 'downloads'
+        manifest = json.loads(
+            (downloads_dir / 'manifest.json').read_text(encoding='utf-8')
+        )
+        assert sorted(manifest) == [
+            'python-3-docs-html.zip', 'python-3-docs-pdf-a4.zip',
+            'python-3-docs.epub'
+        ]
+        assert not (downloads_dir / 'python-3-docs-text.zip').exists()
+
+        calls = mock.call_count
+        main.download(tempfile_session, cli_args)
+        archive_requests = mock.request_history[calls:]
+        assert all(
+            'If-None-Match' in request.headers
+            for request in archive_requests
+        )
+        assert len(archive_requests) == 3, (
+            'Страница загрузки берётся из кеша, архивы запрашиваются условно'
+        )
@@ -0,0 +1,72 @@
+import io
+import json
+import tarfile
+from argparse import Namespace
+
+import pytest
+import requests_mock
+from requests_cache import CachedSession
+try:
+    from src import bundle, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `bundle.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `bundle.py`'
+
+
+def sqlite_session(directory):
+    return CachedSession(str(directory / 'http_cache'), backend='sqlite')
+
+
+def test_export_import_prefetch(tmp_path, pep_site, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    warm_dir, cold_dir = tmp_path / 'warm', tmp_path / 'cold'
+    warm_dir.mkdir()
+    cold_dir.mkdir()
+    warm = sqlite_session(warm_dir)
+    with requests_mock.Mocker() as mock:
+        count = pep_site(mock, count=12)
+        got = main.cache_prefetch(warm, Namespace(target='pep', workers=4))
+        assert got[1] == ('pep', count, count, 0)
+
+    bundle_path = tmp_path / 'bundle.tar.gz'
+    main.cache_export(warm, Namespace(bundle=bundle_path))
+    with tarfile.open(bundle_path, 'r:gz') as tar:
+        manifest = json.load(tar.extractfile(bundle.MANIFEST))
+    assert manifest['version'] == bundle.const.BUNDLE_VERSION
+    assert bundle.const.HTTP_CACHE_NAME in manifest['files']
+
+    cold = sqlite_session(cold_dir)
+    main.cache_import(cold, Namespace(bundle=bundle_path))
+    with requests_mock.Mocker() as mock:
+        results = main.pep(cold, Namespace(workers=4))
+        assert mock.call_count == 0, (
+            'После импорта архива страницы должны браться из кеша'
+        )
+    assert results[-1] == ('Total', count)
+
+
+def test_import_rejects_other_version(tmp_path):
+    bundle_path = tmp_path / 'bundle.tar.gz'
+    data = json.dumps({
+        'format': bundle.const.BUNDLE_FORMAT, 'version': 999, 'files': {}
+    }).encode('utf-8')
+    with tarfile.open(bundle_path, 'w:gz') as tar:
+        info = tarfile.TarInfo(bundle.MANIFEST)
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    with pytest.raises(Exception) as excinfo:
+        bundle.import_bundle({}, bundle_path)
+    assert excinfo.typename == 'BundleException'
+
+
+@pytest.mark.parametrize('content', [None, b'not a gzip archive'])
+def test_import_unreadable_bundle(tmp_path, content):
+    bundle_path = tmp_path / 'bundle.tar.gz'
+    if content is not None:
+        bundle_path.write_bytes(content)
+    with pytest.raises(Exception) as excinfo:
+        bundle.import_bundle({}, bundle_path)
+    assert excinfo.typename == 'BundleException', (
+        'Отсутствующий или повреждённый архив должен давать BundleException'
+    )
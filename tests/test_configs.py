@@ -29,7 +29,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'parquet', 'arrow'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +64,22 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('argv, error', [
+    (['history', '-t', 'pep'], False),
+    (['diff', '-t', 'whats-new'], False),
+    (['cache-prefetch', '-t', 'download'], False),
+    (['history', '-t', 'download'], True),
+    (['diff', '-t', 'download'], True),
+])
+def test_check_target(argv, error):
+    parser = configs.configure_argument_parser(
+        ['history', 'diff', 'cache-prefetch']
+    )
+    args = parser.parse_args(argv)
+    if error:
+        with pytest.raises(SystemExit):
+            configs.check_target(parser, args)
+    else:
+        configs.check_target(parser, args)
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+try:
+    from src import history
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+
+HEADER = ('Ссылка на документацию', 'Версия', 'Статус')
+
+
+def test_diff_runs(tmp_path):
+    db_path = tmp_path / 'history.sqlite3'
+    old = history.save_run(db_path, 'latest-versions', [
+        HEADER,
+        ('https://docs.python.org/3.11/', '3.11', 'in development'),
+        ('https://docs.python.org/3.10/', '3.10', 'stable'),
+        ('https://docs.python.org/2.6/', '2.6', 'EOL'),
+    ])
+    new = history.save_run(db_path, 'latest-versions', [
+        HEADER,
+        ('https://docs.python.org/3.12/', '3.12', 'in development'),
+        ('https://docs.python.org/3.11/', '3.11', 'stable'),
+        ('https://docs.python.org/3.10/', '3.10', 'stable'),
+    ])
+
+    got = history.diff_runs(db_path, 'latest-versions', (old, new))
+    assert got[0] == ('Изменение', 'Ключ', 'Было', 'Стало')
+    assert sorted(got[1:]) == sorted([
+        ('Добавлено', 'https://docs.python.org/3.12/',
+         '', '3.12 | in development'),
+        ('Удалено', 'https://docs.python.org/2.6/', '2.6 | EOL', ''),
+        ('Изменено', 'https://docs.python.org/3.11/',
+         '3.11 | in development', '3.11 | stable'),
+    ])
+    assert history.diff_runs(db_path, 'latest-versions') == got, (
+        'По умолчанию сравниваются два последних прогона режима'
+    )
+
+
+def test_diff_runs_unknown(tmp_path):
+    db_path = tmp_path / 'history.sqlite3'
+    run_id = history.save_run(db_path, 'pep', [('Статус', 'Количество')])
+    with pytest.raises(Exception) as excinfo:
+        history.diff_runs(db_path, 'whats-new', (run_id, run_id))
+    assert excinfo.typename == 'HistoryException'
+
+
+def test_diff_query_speed(tmp_path):
+    db_path = tmp_path / 'history.sqlite3'
+    header = ('Статус', 'Количество')
+    for run in range(50):
+        history.save_run(db_path, 'pep', [header] + [
+            (f'Status {number}', number + run % 2) for number in range(500)
+        ])
+    start = time.perf_counter()
+    got = history.diff_runs(db_path, 'pep')
+    elapsed = time.perf_counter() - start
+    assert len(got) == 501
+    assert elapsed < 0.5
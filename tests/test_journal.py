@@ -0,0 +1,144 @@
+import json
+from argparse import Namespace
+
+import pytest
+import requests_mock
+from conftest import PEP_DOC_URL
+try:
+    from src import journal, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `journal.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `journal.py`'
+
+
+def test_load_drops_partial_tail(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text(
+        '{"url": "a", "result": {"Status": "Final"}}\n'
+        '{"url": "b", "result": [1, 2]}\n'
+        '{"url": "c", "res',
+        encoding='utf-8'
+    )
+    assert journal.load(path) == {'a': {'Status': 'Final'}, 'b': [1, 2]}
+    assert path.read_text(encoding='utf-8').endswith('[1, 2]}\n'), (
+        'Недописанная запись должна отрезаться, чтобы журнал можно было '
+        'продолжить'
+    )
+    assert journal.load(tmp_path / 'missing.jsonl') == {}
+
+
+def test_journal_flushes_in_batches(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    with pytest.raises(RuntimeError):
+        with journal.Journal(path, batch_size=3) as progress:
+            for number in range(4):
+                progress.record(f'url-{number}', number)
+                if number == 2:
+                    assert len(journal.load(path)) == 3
+                else:
+                    assert len(journal.load(path)) == 3 * (number > 2)
+            raise RuntimeError
+    assert journal.load(path) == {f'url-{n}': n for n in range(4)}, (
+        'При прерывании буфер журнала должен сбрасываться на диск'
+    )
+
+
+def test_journal_removed_on_commit(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    with journal.Journal(path) as progress:
+        assert list(progress.replay(['a', 'b'], [1, None])) == [1, None]
+    assert journal.load(path) == {'a': 1}, (
+        'Журнал должен оставаться, пока результаты не сохранены'
+    )
+    progress.commit()
+    assert not path.exists()
+
+
+def test_journal_refuses_overwrite(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text(json.dumps({'url': 'a', 'result': 1}) + '\n')
+    with pytest.raises(Exception) as excinfo:
+        journal.Journal(path)
+    assert excinfo.typename == 'JournalException'
+    assert journal.load(path) == {'a': 1}
+
+
+def test_replay_skips_journaled(tmp_path):
+    path = tmp_path / 'pep.jsonl'
+    path.write_text(json.dumps({'url': 'b', 'result': 2}) + '\n')
+    with pytest.raises(RuntimeError):
+        with journal.Journal(path, resume=True) as progress:
+            assert progress.pending(['a', 'b', 'c']) == ['a', 'c']
+            got = list(progress.replay(['a', 'b', 'c'], [1, None]))
+            assert got == [1, 2, None]
+            raise RuntimeError
+    assert journal.load(path) == {'a': 1, 'b': 2}, (
+        'Страницы с ошибкой загрузки не должны попадать в журнал'
+    )
+
+
+def test_pep_resume(tmp_path, tempfile_session, pep_site, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        count = pep_site(mock, count=30)
+        expected = main.pep(tempfile_session)
+    assert not (tmp_path / 'journal' / 'pep.jsonl').exists()
+
+    view_pep_page = main.utils.view_pep_page
+    viewed = []
+
+    def interrupted(url, session):
+        if url.endswith('pep-0020/'):
+            raise RuntimeError('Прогон прерван')
+        viewed.append(url)
+        return view_pep_page(url, session)
+
+    monkeypatch.setattr(main.utils, 'view_pep_page', interrupted)
+    args = Namespace(workers=1, resume=False)
+    with requests_mock.Mocker() as mock:
+        pep_site(mock, count=count)
+        with pytest.raises(RuntimeError):
+            main.pep(tempfile_session, args)
+    journaled = journal.load(tmp_path / 'journal' / 'pep.jsonl')
+    assert len(journaled) == 19
+    with requests_mock.Mocker() as mock:
+        pep_site(mock, count=count)
+        with pytest.raises(Exception) as excinfo:
+            main.pep(tempfile_session, args)
+    assert excinfo.typename == 'JournalException', (
+        'Прогон без `--resume` не должен перезаписывать журнал прерванного '
+        'прогона'
+    )
+    assert journal.load(tmp_path / 'journal' / 'pep.jsonl') == journaled
+
+    monkeypatch.setattr(main.utils, 'view_pep_page', lambda url, session: (
+        viewed.append(url) or view_pep_page(url, session)
+    ))
+    viewed.clear()
+    args.resume = True
+    with requests_mock.Mocker() as mock:
+        pep_site(mock, count=count)
+        got = main.pep(tempfile_session, args)
+    assert viewed == [
+        f'{PEP_DOC_URL}pep-{number:04d}/' for number in range(20, count + 1)
+    ], 'С `--resume` должны загружаться только страницы не из журнала'
+    assert got == expected
+    assert not (tmp_path / 'journal' / 'pep.jsonl').exists()
+
+
+def test_pep_keeps_journal_until_saved(tmp_path, tempfile_session, pep_site,
+                                       monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+
+    def broken(path, peps):
+        raise RuntimeError('База метаданных недоступна')
+
+    monkeypatch.setattr(main.pepdb, 'save_peps', broken)
+    with requests_mock.Mocker() as mock:
+        count = pep_site(mock, count=5)
+        with pytest.raises(RuntimeError):
+            main.pep(tempfile_session, Namespace(workers=1))
+    assert len(journal.load(tmp_path / 'journal' / 'pep.jsonl')) == count, (
+        'Журнал должен удаляться только после сохранения результатов'
+    )
@@ -0,0 +1,110 @@
+from argparse import Namespace
+
+import pytest
+import requests
+import requests_mock
+from conftest import MAIN_DOC_URL
+try:
+    from src import linkcheck, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `linkcheck.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `linkcheck.py`'
+
+WHATS_NEW_URL = MAIN_DOC_URL + 'whatsnew/'
+ARTICLES = ('3.12.html', '3.11.html')
+OK_URL = 'https://example.org/ok'
+NO_HEAD_URL = 'https://example.org/no-head'
+MOVED_URL = 'https://example.org/moved'
+BROKEN_URL = 'https://broken.example.net/'
+
+
+def register_links(mock):
+    mock.head(OK_URL, status_code=200)
+    mock.head(NO_HEAD_URL, status_code=405)
+    mock.get(NO_HEAD_URL, status_code=200)
+    mock.head(MOVED_URL, status_code=301, headers={'Location': OK_URL})
+    mock.head(BROKEN_URL, exc=requests.ConnectionError)
+
+
+def register_articles(mock):
+    items = ''.join(
+        f'<li class="toctree-l1"><a href="{article}">{article}</a></li>'
+        for article in ARTICLES
+    )
+    mock.get(WHATS_NEW_URL, text=(
+        '<div id="what-s-new-in-python"><div class="toctree-wrapper">'
+        f'<ul>{items}</ul></div></div>'
+    ))
+    mock.get(WHATS_NEW_URL + ARTICLES[0], text=(
+        f'<a href="{OK_URL}#section">ok</a><a href="{NO_HEAD_URL}">head</a>'
+        '<a href="mailto:docs@python.org">mail</a>'
+    ))
+    mock.get(WHATS_NEW_URL + ARTICLES[1], text=(
+        f'<a href="{OK_URL}">ok</a><a href="{MOVED_URL}">moved</a>'
+        f'<a href="{BROKEN_URL}">broken</a>'
+    ))
+
+
+@pytest.mark.parametrize('url, status, target, error', [
+    (OK_URL, 200, '', ''),
+    (NO_HEAD_URL, 200, '', ''),
+    (MOVED_URL, 200, OK_URL, ''),
+    (BROKEN_URL, 0, '', 'ConnectionError'),
+])
+def test_check_link(tempfile_session, url, status, target, error):
+    with requests_mock.Mocker() as mock:
+        register_links(mock)
+        got = linkcheck.check_link(tempfile_session, url)
+    assert (got[0], got[1], got[3]) == (status, target, error)
+    assert got[2] >= 0
+
+
+def test_check_links_ttl_cache(tmp_path, tempfile_session):
+    db_path = tmp_path / 'link_check.sqlite3'
+    urls = [OK_URL, BROKEN_URL]
+    with requests_mock.Mocker() as mock:
+        register_links(mock)
+        first = linkcheck.check_links(tempfile_session, urls, db_path)
+        calls = mock.call_count
+        assert linkcheck.check_links(tempfile_session, urls, db_path) == first
+        assert mock.call_count == calls, 'Свежие результаты берутся из кеша'
+        linkcheck.check_links(tempfile_session, urls, db_path, ttl=0)
+        assert mock.call_count > calls, 'Устаревшие результаты перепроверяются'
+
+
+def test_check_links_rechecks_failures(tmp_path, tempfile_session,
+                                       monkeypatch):
+    db_path = tmp_path / 'link_check.sqlite3'
+    throttled_url = 'https://example.org/throttled'
+    urls = [OK_URL, BROKEN_URL, throttled_url]
+    with requests_mock.Mocker() as mock:
+        register_links(mock)
+        unavailable = {'status_code': 503, 'headers': {'Retry-After': '0'}}
+        mock.head(throttled_url, **unavailable)
+        mock.get(throttled_url, **unavailable)
+        linkcheck.check_links(tempfile_session, urls, db_path)
+        monkeypatch.setattr(linkcheck.const, 'LINK_CHECK_FAILURE_TTL', 0)
+        mock.reset_mock()
+        linkcheck.check_links(tempfile_session, urls, db_path)
+        rechecked = {request.url for request in mock.request_history}
+    assert rechecked == {BROKEN_URL, throttled_url}, (
+        'Временные сбои должны перепроверяться раньше общего TTL'
+    )
+
+
+def test_link_check_mode(tmp_path, tempfile_session, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        register_articles(mock)
+        register_links(mock)
+        got = main.link_check(tempfile_session, Namespace(workers=4))
+    header, *rows = got
+    assert header == main.records.LinkStatus.HEADER
+    assert [row.url for row in rows] == [
+        BROKEN_URL, MOVED_URL, NO_HEAD_URL, OK_URL
+    ], 'Ссылки без повторов, неработающие — первыми'
+    assert rows[0].status == 0
+    assert rows[0].article == WHATS_NEW_URL + ARTICLES[1]
+    assert rows[1].target == OK_URL
+    assert rows[3].article == WHATS_NEW_URL + ARTICLES[0]
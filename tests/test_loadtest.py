@@ -0,0 +1,145 @@
+import threading
+
+import pytest
+import requests
+import requests_mock
+from conftest import PEP_DOC_URL, pep_index_html, pep_page_html
+try:
+    from src import cassette, loadtest, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `loadtest.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `loadtest.py`'
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def pep_interactions(count):
+    interactions = {
+        ('GET', PEP_DOC_URL): (
+            200, HTML, pep_index_html(count).encode('utf-8')
+        )
+    }
+    for number in range(1, count + 1):
+        interactions['GET', f'{PEP_DOC_URL}pep-{number:04d}/'] = (
+            200, HTML, pep_page_html(number).encode('utf-8')
+        )
+    return interactions
+
+
+def test_record_and_load(tmp_path, tempfile_session):
+    cassette_path = tmp_path / 'pep.jsonl'
+    cassette.record(tempfile_session, cassette_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(PEP_DOC_URL, text='index', headers={'ETag': '"1"'})
+        tempfile_session.get(PEP_DOC_URL + '#numerical-index')
+    got = cassette.load(cassette_path)
+    assert got['GET', PEP_DOC_URL][0] == 200
+    assert got['GET', PEP_DOC_URL][1]['ETag'] == '"1"'
+    assert got['GET', PEP_DOC_URL][2] == b'index'
+
+
+def test_replay_methods_and_redirects(tmp_path, tempfile_session):
+    page_url = 'https://example.org/page'
+    moved_url = 'https://example.org/moved'
+    cassette_path = tmp_path / 'links.jsonl'
+    cassette.record(tempfile_session, cassette_path)
+    with requests_mock.Mocker() as mock:
+        mock.head(page_url, status_code=405)
+        mock.get(page_url, text='body')
+        mock.get(moved_url, status_code=301, headers={'Location': page_url})
+        tempfile_session.get(page_url)
+        tempfile_session.head(page_url)
+        tempfile_session.get(moved_url)
+    interactions = cassette.load(cassette_path)
+    assert interactions['GET', page_url][2] == b'body', (
+        'Ответ на HEAD не должен заменять записанный ответ на GET'
+    )
+    assert interactions['GET', moved_url][1]['Location'] == page_url
+
+    server = loadtest.ReplayServer(interactions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = requests.Session()
+    loadtest.mount_replay(session, server.base_url)
+    try:
+        assert session.head(page_url).status_code == 405
+        response = session.get(moved_url)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert (response.status_code, response.text) == (200, 'body')
+    assert [r.status_code for r in response.history] == [301]
+
+
+def test_run_pep_with_latency(tmp_path, monkeypatch):
+    user_dir = tmp_path / 'user'
+    monkeypatch.setattr(main, 'BASE_DIR', user_dir)
+    count = 15
+    got = loadtest.run(
+        main.pep,
+        pep_interactions(count),
+        loadtest.Faults(latency=loadtest.parse_latency('uniform:1:5')),
+        repeat=2,
+        workers=4,
+        seed=1
+    )
+    header, *runs = got
+    assert len(runs) == 2
+    for run in runs:
+        assert run[header.index('Ответов')] == count + 1
+        assert run[header.index('p99, мс')] >= 1
+    assert not user_dir.exists(), (
+        'Нагрузочный прогон не должен менять базы и журналы пользователя'
+    )
+
+
+@pytest.mark.parametrize('faults, expected', [
+    (loadtest.Faults(throttle_rate=1.0, retry_after=7), 429),
+    (loadtest.Faults(error_rate=1.0), 503),
+    (loadtest.Faults(), 200),
+])
+def test_replay_faults(faults, expected):
+    server = loadtest.ReplayServer(pep_interactions(1), faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        response = requests.get(f'{server.base_url}/{PEP_DOC_URL}')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response.status_code == expected
+    if expected == 429:
+        assert response.headers['Retry-After'] == '7'
+
+
+def test_replay_reset():
+    server = loadtest.ReplayServer(
+        pep_interactions(1), loadtest.Faults(reset_rate=1.0)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(requests.ConnectionError):
+            requests.get(f'{server.base_url}/{PEP_DOC_URL}')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert server.stats['resets'] == 1
+
+
+@pytest.mark.parametrize('argv, mode', [
+    (['run', 'pep'], 'pep'),
+    (['run', 'link-check'], 'link-check'),
+    (['serve'], None),
+    (['run'], SystemExit),
+    (['run', 'watch'], SystemExit),
+    (['run', 'merge'], SystemExit),
+    (['run', 'cache-import'], SystemExit),
+])
+def test_parse_arguments_modes(tmp_path, argv, mode):
+    argv = [*argv, '--cassette', str(tmp_path / 'cassette.jsonl')]
+    modes = loadtest.const.LOADTEST_MODES
+    assert set(modes) <= set(main.MODE_TO_FUNCTION)
+    if mode is SystemExit:
+        with pytest.raises(SystemExit):
+            loadtest.parse_arguments(modes, argv)
+    else:
+        assert loadtest.parse_arguments(modes, argv).mode == mode
@@ -1,6 +1,12 @@
+import logging
+import sys
 from pathlib import Path
+
+import pytest
+import requests_mock
+from conftest import DOCS_VERSIONS, docs_site_pages
 try:
-    from src import main
+    from src import loadtest, main
 except ModuleNotFoundError:
     assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
 except ImportError:
@@ -93,6 +99,64 @@ def test_download(monkeypatch, tmpdir, mock_session):
     )
 
 
+def test_version_matrix(tempfile_session, docs_site):
+    with requests_mock.Mocker() as mock:
+        docs_site(mock)
+        got = main.version_matrix(tempfile_session)
+    assert got[0] == ('Версия', 'Статус', 'Выпуск', "What's New", 'Архивы')
+    assert got[2] == (
+        '3.12', 'stable', '3.12.4', 'What’s New In Python 3.12',
+        'pdf-a4 10 MiB, pdf-letter 11 MiB, html 12 MiB, text 13 MiB, '
+        'epub 5 MiB'
+    )
+    assert [row[0] for row in got[1:]] == [
+        version for version, _, _ in DOCS_VERSIONS
+    ]
+
+
+def test_version_matrix_fans_out():
+    delay = 0.3
+    interactions = {
+        ('GET', url): (200, {'Content-Type': 'text/html; charset=utf-8'},
+                       text.encode('utf-8'))
+        for url, text in docs_site_pages().items()
+    }
+    got = loadtest.run(
+        main.version_matrix,
+        interactions,
+        loadtest.Faults(
+            latency=loadtest.parse_latency(f'fixed:{delay * 1000}')
+        ),
+        workers=9
+    )
+    header, run = got
+    pages = 1 + 3 * len(DOCS_VERSIONS)
+    assert run[header.index('Ответов')] == pages
+    assert run[header.index('Строк результата')] == len(DOCS_VERSIONS)
+    assert run[header.index('Время, с')] < 2 * delay + 0.25, (
+        'Время должно складываться из загрузки главной страницы и одной '
+        'волны страниц версий'
+    )
+
+
+MODES = {
+    'whats-new': 'whats_new',
+    'latest-versions': 'latest_versions',
+    'download': 'download',
+    'version-matrix': 'version_matrix',
+    'pep': 'pep',
+    'merge': 'merge',
+    'pep-query': 'pep_query',
+    'link-check': 'link_check',
+    'diff': 'diff',
+    'history': 'show_history',
+    'watch': 'watch',
+    'cache-export': 'cache_export',
+    'cache-import': 'cache_import',
+    'cache-prefetch': 'cache_prefetch',
+}
+
+
 def test_mode_to_function():
     got = main.MODE_TO_FUNCTION
     assert isinstance(got, dict), (
@@ -104,7 +168,7 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in MODES
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -114,10 +178,29 @@ def test_mode_to_function():
             f'`{func}` - это функция.'
         )
         assert (
-            func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
-            ]
+            func.__name__ in MODES.values()
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('argv', [
+    ['pep-query'], ['diff', '-t', 'pep'], ['merge'],
+    ['cache-import', '--bundle', 'missing.tar.gz'],
+])
+def test_main_logs_missing_data(argv, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(main.conf, 'configure_logging', lambda: None)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        sys, 'argv',
+        ['main.py', *argv, '--shard-dir', str(tmp_path / 'shards')]
+    )
+    with caplog.at_level(logging.ERROR):
+        main.main()
+    errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 1, (
+        'Отсутствие данных должно выводиться одной строкой лога, '
+        'а не трассировкой'
+    )
@@ -0,0 +1,106 @@
+import tracemalloc
+from argparse import Namespace
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from conftest import PEP_DOC_URL, pep_index_html, pep_page_html
+try:
+    from src import main, memory
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memory.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memory.py`'
+
+PEP_COUNT = 800
+PEAK_BUDGET = 4 * 2 ** 20
+RETAINED_BUDGET = 2 * 2 ** 20
+RSS_BUDGET = 16 * 2 ** 20
+PROC_SELF = Path('/proc/self')
+
+
+class PepSiteSession:
+    """Сессия без кеша и истории запросов, отдающая синтетический индекс."""
+
+    def __init__(self, count):
+        self.count = count
+
+    def get(self, url):
+        if url == PEP_DOC_URL:
+            body = pep_index_html(self.count)
+        else:
+            body = pep_page_html(int(url.rstrip('/').rsplit('-', 1)[1]))
+        return SimpleNamespace(
+            url=url,
+            status_code=200,
+            headers={'Content-Type': 'text/html; charset=utf-8'},
+            content=body.encode('utf-8'),
+        )
+
+
+def proc_status(key):
+    """Значение памяти процесса из `/proc/self/status` в байтах."""
+    for line in (PROC_SELF / 'status').read_text().splitlines():
+        if line.startswith(f'{key}:'):
+            return int(line.split()[1]) * 1024
+    raise KeyError(key)
+
+
+def reset_peak_rss():
+    """Сбрасывает пик RSS процесса (`VmHWM`) до текущего RSS."""
+    try:
+        (PROC_SELF / 'clear_refs').write_text('5')
+    except OSError:
+        pytest.skip('Пик RSS процесса нельзя сбросить')
+
+
+def test_nested_stage_peak():
+    memory.start()
+    try:
+        with memory.stage('внешняя'):
+            with memory.stage('внутренняя'):
+                block = bytearray(2 ** 20)
+                del block
+            small = bytearray(2 ** 10)
+            del small
+    finally:
+        tracemalloc.stop()
+    (inner, inner_peak, _), (outer, outer_peak, _) = memory.STAGES
+    assert (inner, outer) == ('внутренняя', 'внешняя')
+    assert inner_peak >= 2 ** 20
+    assert outer_peak >= inner_peak, (
+        'Пик внешней стадии должен учитывать пик вложенной'
+    )
+
+
+def test_pep_peak_memory_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    session = PepSiteSession(PEP_COUNT)
+    tracemalloc.start()
+    try:
+        results = main.pep(session, Namespace(workers=4))
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert results[-1] == ('Total', PEP_COUNT)
+    assert peak < PEAK_BUDGET, (
+        f'Пик памяти {peak / 2 ** 20:.1f} МиБ превышает бюджет '
+        f'{PEAK_BUDGET / 2 ** 20:.0f} МиБ'
+    )
+    assert retained < RETAINED_BUDGET, (
+        'Деревья страниц должны разрушаться сразу после разбора'
+    )
+
+
+def test_pep_peak_rss_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    session = PepSiteSession(PEP_COUNT)
+    reset_peak_rss()
+    before = proc_status('VmRSS')
+    results = main.pep(session, Namespace(workers=4))
+    growth = proc_status('VmHWM') - before
+    assert results[-1] == ('Total', PEP_COUNT)
+    assert growth < RSS_BUDGET, (
+        f'Пик RSS вырос на {growth / 2 ** 20:.1f} МиБ, бюджет '
+        f'{RSS_BUDGET / 2 ** 20:.0f} МиБ'
+    )
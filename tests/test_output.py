@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -90,3 +91,114 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_pretty_output_streams_rows(capsys, monkeypatch):
+    monkeypatch.setattr(outputs.const, 'TABLE_SAMPLE_SIZE', 5)
+
+    def rows():
+        yield ('Ссылка', 'Статус')
+        for number in range(1000):
+            if number == 10:
+                captured_out, _ = capsys.readouterr()
+                assert '| https://peps.python.org/pep-0000/ |' in (
+                    captured_out
+                ), 'Первые строки должны выводиться до конца данных'
+            yield (f'https://peps.python.org/pep-{number:04d}/', 'Final')
+
+    outputs.pretty_output(rows())
+    captured_out, _ = capsys.readouterr()
+    assert 'pep-0999' in captured_out
+    assert captured_out.rstrip().endswith('+')
+
+
+def test_pretty_output_wraps_long_values(capsys, monkeypatch):
+    monkeypatch.setattr(outputs.const, 'TABLE_SAMPLE_SIZE', 1)
+    outputs.pretty_output([
+        ('Статус', 'Количество'),
+        ('Final', 1),
+        ('Superseded', 15),
+    ])
+    captured_out, _ = capsys.readouterr()
+    lines = captured_out.splitlines()
+    assert len({len(line) for line in lines}) == 1, (
+        'Все строки таблицы должны иметь одинаковую ширину'
+    )
+    assert '| Supers | 15         |' in captured_out
+    assert '| eded   |            |' in captured_out
+
+
+def test_pretty_output_wide_characters(capsys, monkeypatch):
+    monkeypatch.setattr(outputs.const, 'TABLE_SAMPLE_SIZE', 1)
+    monkeypatch.setattr(outputs.const, 'TABLE_MAX_COLUMN_WIDTH', 6)
+    outputs.pretty_output([
+        ('Заголовок', 'Автор'),
+        ('Python 🐍', '吉田'),
+        ('中文文档标题', 'Guido'),
+    ])
+    captured_out, _ = capsys.readouterr()
+    lines = captured_out.splitlines()
+    assert len({outputs.display_width(line) for line in lines}) == 1, (
+        'Широкие символы должны учитываться при выравнивании столбцов'
+    )
+    assert '| Python | 吉田  |' in captured_out
+    assert '|  🐍    |       |' in captured_out
+    assert '| 中文文 | Guido |' in captured_out
+
+
+def status_results(count):
+    from src import records
+    return [records.StatusCount.HEADER] + [
+        records.StatusCount(f'Status {number}', number)
+        for number in range(count)
+    ]
+
+
+@pytest.mark.parametrize('output_format', ['parquet', 'arrow'])
+def test_control_output_columnar(monkeypatch, tmp_path, output_format):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(outputs.const, 'COLUMNAR_BATCH_SIZE', 4)
+    outputs.control_output(status_results(10), cli_args('pep', output_format))
+
+    file_path, = (tmp_path / 'results').glob(f'pep_*.{output_format}')
+    if output_format == 'parquet':
+        table = pq.read_table(file_path)
+    else:
+        with pa.ipc.open_file(file_path) as reader:
+            assert reader.num_record_batches == 3, (
+                'Строки должны записываться пакетами'
+            )
+            table = reader.read_all()
+    assert table.schema.field('count').type == pa.int64(), (
+        'Количество должно сохраняться числом, а не строкой'
+    )
+    assert table.column('count').to_pylist() == list(range(10))
+    assert table.schema.metadata[b'header'] == 'Статус\tКоличество'.encode()
+
+
+def test_columnar_output_typed_empty_and_untyped(monkeypatch, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    outputs.columnar_output(
+        status_results(0), cli_args('merge', 'parquet')
+    )
+    outputs.columnar_output(
+        [('Ключ', 'Значение'), ('a', 1.5)], cli_args('loadtest', 'parquet')
+    )
+    empty = pq.read_table(next((tmp_path / 'results').glob('merge_*')))
+    assert empty.num_rows == 0
+    assert empty.schema.names == ['status', 'count']
+    untyped = pq.read_table(next((tmp_path / 'results').glob('loadtest_*')))
+    assert untyped.schema.field('Значение').type == pa.float64()
+
+
+def test_columnar_output_without_pyarrow(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    outputs.control_output(status_results(3), cli_args('pep', 'parquet'))
+    assert [path.suffix for path in (tmp_path / 'results').iterdir()] == [
+        '.csv'
+    ], 'Без pyarrow результаты сохраняются в CSV'
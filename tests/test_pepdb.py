@@ -0,0 +1,66 @@
+from argparse import Namespace
+
+import pytest
+import requests_mock
+from conftest import PEP_STATUSES
+try:
+    from src import main, pepdb
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pepdb.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pepdb.py`'
+
+
+@pytest.fixture
+def pep_db(tmp_path, tempfile_session, pep_site, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        count = pep_site(mock, count=20)
+        main.pep(tempfile_session)
+    return count
+
+
+def test_pep_saves_header_fields(pep_db, tmp_path):
+    got = main.pep_query(None, Namespace(where=[('PEP', '8')]))
+    assert got == [
+        ('PEP', 'Заголовок', 'Type', 'Status', 'Python-Version'),
+        (8, 'PEP 8 – Title 8', 'Process', 'Rejected', '3.0'),
+    ]
+    got = main.pep_query(None, Namespace(where=[('author', 'author 13')]))
+    assert [row[0] for row in got[1:]] == [13], (
+        'Имена полей и значения сравниваются без учёта регистра'
+    )
+
+
+def test_pep_query_group_by(pep_db):
+    got = main.pep_query(None, Namespace(
+        where=[('Status', 'Final')], group_by='Python-Version'
+    ))
+    final = [
+        number for number in range(1, pep_db + 1)
+        if PEP_STATUSES[number % len(PEP_STATUSES)][2] == 'Final'
+    ]
+    assert got[0] == ('Python-Version', 'Количество')
+    assert sum(count for _, count in got[1:]) == len(final)
+    assert dict(got[1:]) == {
+        f'3.{version}': sum(number % 4 == version for number in final)
+        for version in {number % 4 for number in final}
+    }
+
+
+def test_pep_rerun_replaces_fields(pep_db, tmp_path, tempfile_session):
+    pepdb.save_peps(tmp_path / 'pep.sqlite3', [(
+        'https://peps.python.org/pep-0008/',
+        {'Title': 'PEP 8', 'Status': 'Active', 'Requires': '1, 2'}
+    )])
+    got = main.pep_query(None, Namespace(where=[('Requires', '2')]))
+    assert got[1:] == [(8, 'PEP 8', None, 'Active', None)]
+    total = main.pep_query(None, Namespace(group_by='Status'))
+    assert sum(count for _, count in total[1:]) == pep_db
+
+
+def test_pep_query_without_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with pytest.raises(Exception) as excinfo:
+        main.pep_query(None, Namespace(where=[('Status', 'Final')]))
+    assert excinfo.typename == 'PepDatabaseException'
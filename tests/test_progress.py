@@ -0,0 +1,95 @@
+import json
+import logging
+from argparse import Namespace
+
+import pytest
+import requests_mock
+try:
+    from src import main, progress
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `progress.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `progress.py`'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(progress.time, 'monotonic', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def events(monkeypatch):
+    got = []
+    monkeypatch.setitem(progress._config, 'sink', got.append)
+    monkeypatch.setitem(progress._config, 'interval', 1.0)
+    return got
+
+
+def test_track_without_sink_returns_iterable(monkeypatch):
+    monkeypatch.setitem(progress._config, 'sink', None)
+    items = [1, 2, 3]
+    assert progress.track(items, len(items), 'стадия') is items, (
+        'Без приёмника прогресс не должен оборачивать цикл'
+    )
+
+
+def test_track_rate_limits_events(clock, events):
+    for _ in progress.track(range(10), 10, 'стадия'):
+        clock[0] += 0.25
+    assert [event['done'] for event in events] == [4, 8, 10], (
+        'События должны выдаваться не чаще раза в интервал и в конце'
+    )
+    assert [event['final'] for event in events] == [False, False, True]
+    assert events[0]['rate'] == 4.0
+    assert events[0]['eta'] == 1.5
+    assert events[-1]['eta'] == 0.0
+    assert events[-1]['stage'] == 'стадия'
+
+
+def test_interrupted_track_has_no_final_event(clock, events):
+    with pytest.raises(RuntimeError):
+        for number in progress.track(range(10), 10, 'стадия'):
+            if number == 3:
+                raise RuntimeError
+    assert not any(event['final'] for event in events)
+
+
+def test_configure_sinks(tmp_path, monkeypatch, clock, caplog):
+    monkeypatch.setattr(progress.sys.stderr, 'isatty', lambda: False)
+    progress.configure('auto')
+    assert progress._config['sink'] is None
+
+    path = tmp_path / 'progress' / 'events.jsonl'
+    progress.configure('jsonl', path)
+    list(progress.track(range(3), 3, 'стадия'))
+    list(progress.track(iter(range(2)), None, 'без total'))
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e['stage'], e['done'], e['total']) for e in events] == [
+        ('стадия', 3, 3), ('без total', 2, None)
+    ]
+
+    progress.configure('log')
+    with caplog.at_level(logging.INFO):
+        list(progress.track(range(3), 3, 'стадия'))
+    assert 'стадия: 3/3' in caplog.text
+    progress.configure('none')
+
+
+def test_pep_progress_events(tmp_path, tempfile_session, pep_site,
+                             monkeypatch):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    path = tmp_path / 'progress.jsonl'
+    main.progress.configure('jsonl', path)
+    try:
+        with requests_mock.Mocker() as mock:
+            count = pep_site(mock, count=10)
+            main.pep(tempfile_session, Namespace(workers=2))
+    finally:
+        main.progress.configure('none')
+    event = json.loads(path.read_text().splitlines()[-1])
+    assert (event['stage'], event['done'], event['total']) == (
+        'страницы PEP', count, count
+    )
+    assert event['final']
@@ -0,0 +1,58 @@
+import json
+from argparse import Namespace
+
+import pytest
+import requests_mock
+try:
+    from src import main, shards
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+
+def test_in_shard_partition():
+    keys = [f'pep-{number:04d}/' for number in range(200)]
+    for shards_count in (1, 3, 7):
+        owners = [
+            [
+                shard for shard in range(1, shards_count + 1)
+                if shards.in_shard(key, shard, shards_count)
+            ]
+            for key in keys
+        ]
+        assert all(len(owner) == 1 for owner in owners), (
+            'Каждая строка индекса должна попадать ровно в один шард'
+        )
+
+
+def test_sharded_pep_merge(tmp_path, tempfile_session, pep_site):
+    with requests_mock.Mocker() as mock:
+        pep_site(mock, count=30)
+        expected = main.pep(tempfile_session, Namespace(base_dir=tmp_path))
+        for shard in range(1, 4):
+            main.pep(
+                tempfile_session,
+                Namespace(
+                    shard=(shard, 3), shard_dir=tmp_path, base_dir=tmp_path
+                )
+            )
+
+    got = main.merge(None, Namespace(shard_dir=tmp_path))
+    assert got[0] == expected[0]
+    assert got[-1] == expected[-1]
+    assert sorted(got[1:-1]) == sorted(expected[1:-1]), (
+        'Объединённые шарды должны дать ту же таблицу, что и полный прогон'
+    )
+    shard_file = tmp_path / shards.shard_file_name(1, 3)
+    with open(shard_file, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['shards'] == 3
+    assert set(data) >= {'total_by_status', 'mismatches'}
+
+
+def test_merge_missing_shard(tmp_path):
+    shards.write_shard(tmp_path, 1, 2, {'Final': 1}, [])
+    with pytest.raises(Exception) as excinfo:
+        shards.merge_shards(tmp_path)
+    assert excinfo.typename == 'ShardException'
@@ -0,0 +1,107 @@
+import requests
+import requests_mock
+try:
+    from src import throttle
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttle.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttle.py`'
+
+
+def test_limiter_aimd():
+    limiter = throttle.HostLimiter('example.com', initial=4, maximum=8)
+    for _ in range(40):
+        limiter.acquire()
+        limiter.release(latency=0.01, status=200)
+    assert limiter.limit > 6, 'Быстрые ответы должны увеличивать лимит'
+
+    before = limiter.limit
+    limiter.acquire()
+    limiter.release(latency=0.01, status=429, retry_after=0.05)
+    assert limiter.limit == before / 2
+    assert limiter.throttled == 1
+    assert limiter.blocked_until > 0
+
+    limiter.acquire()
+    limiter.release()
+    assert limiter.limit == before / 2, (
+        'Ответы из кеша не должны менять лимит'
+    )
+
+
+def test_limiter_never_below_one():
+    limiter = throttle.HostLimiter('example.com', initial=2)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(error=True)
+    assert limiter.limit == 1.0
+    assert limiter.in_flight == 0
+
+
+def test_limiter_start_at():
+    limiter = throttle.HostLimiter('example.com', initial=4, maximum=8)
+    limiter.start_at(2)
+    assert limiter.limit == 2.0, '`--workers` ниже начального лимита'
+    limiter.start_at(6)
+    assert limiter.limit == 2.0, 'Начальный лимит задаётся один раз'
+
+    limiter = throttle.HostLimiter('example.com', initial=4, maximum=8)
+    limiter.start_at(20)
+    assert limiter.limit == 8.0
+
+    limiter = throttle.HostLimiter('example.com', initial=4)
+    limiter.acquire()
+    limiter.release(latency=0.01, status=429)
+    limiter.start_at(4)
+    assert limiter.limit == 2.0, (
+        'Лимит, сниженный ответами хоста, не должен подниматься'
+    )
+
+
+def test_parse_retry_after():
+    assert throttle.parse_retry_after('3') == 3.0
+    assert throttle.parse_retry_after(None) is None
+    assert throttle.parse_retry_after('soon') is None
+    assert throttle.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert throttle.parse_retry_after('100000') == (
+        throttle.const.MAX_RETRY_AFTER
+    )
+
+
+def test_send_retries_throttled():
+    url = 'https://throttled.example.com/page'
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [
+            {'status_code': 429, 'headers': {'Retry-After': '0'}},
+            {'status_code': 503, 'headers': {'Retry-After': '0'}},
+            {'text': 'ok'},
+        ])
+        response = throttle.send(requests.Session(), url)
+    assert response.text == 'ok'
+    limiter = throttle.limiter_for(url)
+    assert (limiter.throttled, limiter.retries) == (2, 2)
+    assert limiter.host in [host for host, *_ in throttle.snapshot()]
+
+
+def test_send_closes_discarded_responses():
+    url = 'https://discarded.example.com/page'
+    session = requests.Session()
+    closed = []
+
+    def get(url):
+        response = session.get(url, stream=True)
+        response.close = lambda: closed.append(response.status_code)
+        return response
+
+    with requests_mock.Mocker() as mock:
+        mock.get(url, [
+            {'status_code': 429, 'headers': {'Retry-After': '0'}},
+            {'status_code': 503, 'headers': {'Retry-After': '0'}},
+            {'text': 'ok'},
+        ])
+        response = throttle.send(session, url, get=get)
+    assert response.status_code == 200
+    assert closed == [429, 503], (
+        'Ответы 429/503 должны закрываться перед повтором, чтобы '
+        'соединение вернулось в пул'
+    )
@@ -1,8 +1,13 @@
+import hashlib
+import tracemalloc
+
 import pytest
 import requests
 import requests_mock
 import bs4
-from conftest import MAIN_DOC_URL
+from conftest import (
+    MAIN_DOC_URL, PEP_DOC_URL, docs_download_html, pep_index_html
+)
 try:
     from src import utils
 except ModuleNotFoundError:
@@ -54,3 +59,121 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def peak_allocation(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def test_soup_from_response_skips_str_copy():
+    body = pep_index_html(2000).replace('PEP ', 'PEP – Łukasz ')
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            PEP_DOC_URL,
+            content=body.encode('utf-8'),
+            headers={'Content-Type': 'text/html; charset=utf-8'}
+        )
+        response = requests.get(PEP_DOC_URL)
+
+    soup_bytes, peak_bytes = peak_allocation(
+        utils.soup_from_response, response
+    )
+    soup_text, peak_text = peak_allocation(
+        bs4.BeautifulSoup, response.text, 'lxml'
+    )
+    assert soup_bytes.find_all('tr')[-1].text == (
+        soup_text.find_all('tr')[-1].text
+    )
+    assert peak_text - peak_bytes > len(response.content) // 2, (
+        'Разбор байтов не должен создавать копию страницы в виде str: '
+        f'{peak_bytes} против {peak_text} байт'
+    )
+
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('text/html; charset=ISO-8859-1', 'ISO-8859-1'),
+    ('text/html; charset="koi8-r"', 'koi8-r'),
+    ('text/html', 'utf-8'),
+])
+def test_get_charset(content_type, expected):
+    response = requests.Response()
+    response.headers['Content-Type'] = content_type
+    assert utils.get_charset(response) == expected
+
+
+def test_make_head_soup_stops_early(tempfile_session):
+    url = MAIN_DOC_URL + 'whatsnew/3.10.html'
+    article = (
+        '<html><body><h1>What’s New In Python 3.10</h1>'
+        '<dl><dt>Release</dt><dd>3.10.1</dd>'
+        '<dt>Editor</dt><dd>Pablo Galindo Salgado</dd></dl>'
+        + '<p>Details.</p>' * 100000 + '</body></html>'
+    ).encode('utf-8')
+    streamed = utils.fetch.STATS['streamed_bytes']
+    with requests_mock.Mocker() as mock:
+        mock.get(url, content=article, headers={
+            'Content-Type': 'text/html; charset=utf-8'
+        })
+        got = utils.view_whats_new_page(url, tempfile_session)
+        assert got[0] == 'What’s New In Python 3.10'
+        assert 'Pablo Galindo Salgado' in got[1]
+        read = utils.fetch.STATS['streamed_bytes'] - streamed
+        assert read < len(article) // 10, (
+            'Чтение статьи должно прекращаться после первых <h1> и <dl>'
+        )
+        assert mock.call_count == 1
+
+        cached = tempfile_session.get(url)
+        assert cached.from_cache
+        assert cached.headers.get('X-Parser-Partial') == '1'
+        assert utils.view_whats_new_page(url, tempfile_session) == got
+        assert mock.call_count == 1, 'Повторное чтение начала — из кеша'
+
+        full = utils.get_response(tempfile_session, url)
+        assert full.content == article, (
+            'Частичная запись кеша не должна отдаваться как полная страница'
+        )
+        assert mock.call_count == 2
+    assert tempfile_session.get(url).content == article
+
+
+def test_parse_archives():
+    url = 'https://docs.python.org/3.12/download.html'
+    soup = bs4.BeautifulSoup(docs_download_html('3.12'), 'lxml')
+    got = utils.parse_archives(soup, url)
+    assert got[0] == (
+        'pdf-a4',
+        'https://docs.python.org/3.12/archives/python-3.12-docs-pdf-a4.zip',
+        '10 MiB'
+    )
+    assert [archive_format for archive_format, _, _ in got] == [
+        'pdf-a4', 'pdf-letter', 'html', 'text', 'epub'
+    ]
+    assert utils.parse_archives(bs4.BeautifulSoup('', 'lxml'), url) == []
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('3.12.4 Documentation', '3.12.4'),
+    ('3.13.0a1 Documentation', '3.13.0a1'),
+    ('Page not found', ''),
+])
+def test_parse_release(title, expected):
+    soup = bs4.BeautifulSoup(f'<title>{title}</title>', 'lxml')
+    assert utils.parse_release(soup) == expected
+
+
+def test_json_and_checksum_helpers(tmp_path):
+    path = tmp_path / 'state' / 'manifest.json'
+    assert utils.load_json(path) == {}
+    utils.save_json(path, {'docs.zip': {'size': 3}})
+    assert utils.load_json(path) == {'docs.zip': {'size': 3}}
+    assert not path.with_suffix('.tmp').exists()
+    assert utils.file_sha256(path) == hashlib.sha256(
+        path.read_bytes()
+    ).hexdigest()
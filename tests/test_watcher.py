@@ -0,0 +1,71 @@
+import json
+
+import requests
+import requests_mock
+try:
+    from src import watcher
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watcher.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watcher.py`'
+
+MAIN_DOC_URL = 'https://docs.python.org/3/'
+
+
+def sidebar_html(versions):
+    links = ''.join(
+        f'<li><a href="https://docs.python.org/{version}/">'
+        f'Python {version} ({status})</a></li>'
+        for version, status in versions
+    )
+    return (
+        '<html><body><div class="sphinxsidebarwrapper">'
+        f'<ul><li>All versions</li>{links}</ul>'
+        '</div></body></html>'
+    )
+
+
+def test_watch_events(tmp_path):
+    state_path = tmp_path / 'state.json'
+    events_file = tmp_path / 'events.jsonl'
+    first = sidebar_html([('3.11', 'in development'), ('3.10', 'stable')])
+    second = sidebar_html([
+        ('3.12', 'in development'), ('3.11', 'stable'), ('3.10', 'stable')
+    ])
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL, [
+            {'text': first, 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+            {'text': first, 'headers': {'ETag': '"v1b"'}},
+            {'text': second, 'headers': {'ETag': '"v2"'}},
+        ])
+        watcher.watch(
+            requests.Session(), MAIN_DOC_URL, state_path,
+            interval=0, iterations=4, events_file=events_file
+        )
+        sent = [request.headers.get('If-None-Match')
+                for request in mock.request_history]
+
+    assert sent == [None, '"v1"', '"v1"', '"v1b"'], (
+        'Повторные опросы должны быть условными запросами'
+    )
+    with open(events_file, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert [(event['event'], event['version']) for event in events] == [
+        ('new_version', '3.12'), ('status_changed', '3.11')
+    ]
+    assert events[1]['old_status'] == 'in development'
+    assert events[1]['status'] == 'stable'
+
+
+def test_poll_skips_unchanged_body(monkeypatch):
+    def parse_versions(soup):
+        raise AssertionError('Неизменённая страница не должна разбираться')
+
+    state = {}
+    page = sidebar_html([('3.10', 'stable')])
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL, text=page)
+        watcher.poll(requests.Session(), MAIN_DOC_URL, state)
+        monkeypatch.setattr(watcher.utils, 'parse_versions', parse_versions)
+        assert watcher.poll(requests.Session(), MAIN_DOC_URL, state) == []